@@ -0,0 +1,53 @@
+"""
+Throughput of utility_toolkit batch mode versus one interpreter start per call.
+
+Run from the repository root:
+    python -m mini_projects.day4.benchmarks.bench_batch
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from mini_projects.day4.utility_toolkit import run_batch
+
+JOBS = [
+    {"fn": "is_prime", "args": [1_000_003]},
+    {"fn": "factorial", "args": [50]},
+    {"fn": "gcd", "args": [462, 1071]},
+    {"fn": "sentence_to_words", "args": ["The quick, brown fox!"]},
+    {"fn": "calculate_stats", "args": [[1, 2, 3, 4]]},
+]
+# The same calls through the interactive menu (function number, then inputs).
+MENU_INPUTS = ["1\n1000003\n", "2\n50\n", "12\n462\n1071\n", "16\nThe quick, brown fox!\n", "10\n1 2 3 4\n"]
+
+
+if __name__ == "__main__":
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    env = dict(os.environ, PYTHONPATH=repo_root)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        n_batch = 100_000
+        jobs_path = os.path.join(tmpdir, "jobs.jsonl")
+        with open(jobs_path, "w", encoding="utf-8") as f:
+            for i in range(n_batch):
+                f.write(json.dumps(JOBS[i % len(JOBS)]) + "\n")
+        start = time.perf_counter()
+        run_batch(jobs_path, output=os.devnull, history_file=os.path.join(tmpdir, "history.jsonl"))
+        batch_rate = n_batch / (time.perf_counter() - start)
+
+        n_proc = 20
+        start = time.perf_counter()
+        for i in range(n_proc):
+            subprocess.run(
+                [sys.executable, "-m", "mini_projects.day4.utility_toolkit"],
+                input=MENU_INPUTS[i % len(MENU_INPUTS)], capture_output=True, text=True,
+                cwd=tmpdir, env=env, check=False,
+            )
+        proc_rate = n_proc / (time.perf_counter() - start)
+
+    print(f"per-process CLI : {proc_rate:10.1f} calls/s ({n_proc} runs)")
+    print(f"--batch mode    : {batch_rate:10.1f} calls/s ({n_batch} jobs, history logged)")
+    print(f"speedup         : {batch_rate / proc_rate:10.0f}x")
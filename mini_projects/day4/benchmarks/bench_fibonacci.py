@@ -0,0 +1,49 @@
+"""
+Benchmark for the Fibonacci engine in utility_toolkit.
+Reports wall time and peak traced memory for the original list-append approach
+versus fast doubling, the lazy generator and windowed ranges.
+
+Run from the repository root:
+    python -m mini_projects.day4.benchmarks.bench_fibonacci
+"""
+
+import time
+import tracemalloc
+from itertools import islice
+
+from mini_projects.day4.utility_toolkit import (
+    fibonacci,
+    fibonacci_nth,
+    fibonacci_range,
+    iter_fibonacci,
+)
+
+
+def list_append_fibonacci(n: int):
+    """The original implementation, kept here as the baseline."""
+    if n <= 0:
+        return []
+    seq = [0, 1]
+    for _ in range(2, n):
+        seq.append(seq[-1] + seq[-2])
+    return seq[:n]
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<45} {elapsed * 1000:10.2f} ms  peak {peak / 2**20:9.2f} MiB")
+
+
+if __name__ == "__main__":
+    n = 50_000
+    measure(f"F({n}) via list append (baseline)", lambda: list_append_fibonacci(n + 1)[-1])
+    measure(f"F({n}) via fibonacci_nth", lambda: fibonacci_nth(n))
+    measure(f"fibonacci({n}) list (baseline)", lambda: list_append_fibonacci(n))
+    measure(f"fibonacci({n}) list (engine)", lambda: fibonacci(n))
+    measure(f"sum of first {n} via iter_fibonacci", lambda: sum(islice(iter_fibonacci(), n)))
+    measure("fibonacci_range(10**6, 10**6 + 10)", lambda: fibonacci_range(10**6, 10**6 + 10))
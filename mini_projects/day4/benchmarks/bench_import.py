@@ -0,0 +1,51 @@
+"""
+Startup cost of utility_toolkit entry points, measured with `python -X importtime`.
+
+Run from the repository root:
+    python -m mini_projects.day4.benchmarks.bench_import
+"""
+
+import os
+import subprocess
+import sys
+
+PACKAGE = "mini_projects.day4.utility_toolkit"
+ENTRY_POINTS = [
+    ("from utility_toolkit import gcd", f"from {PACKAGE} import gcd"),
+    ("from utility_toolkit import clean_text", f"from {PACKAGE} import clean_text"),
+    ("from utility_toolkit import calculate_stats", f"from {PACKAGE} import calculate_stats"),
+    ("from utility_toolkit import run_batch", f"from {PACKAGE} import run_batch"),
+    ("import utility_toolkit.cli", f"import {PACKAGE}.cli"),
+]
+# Stdlib modules a pure-math or text caller should never pay for.
+HEAVY_MODULES = ("json", "ast", "datetime", "typing", "string", "re", "threading", "concurrent.futures")
+REPEATS = 5
+
+
+def import_profile(statement, env):
+    """Return (cumulative µs of the statement's imports, top-level module names imported)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    total = 0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        loaded.add(name.strip())
+        if not name.startswith("  "):  # top-level import: cumulative covers its children
+            total += int(cumulative)
+    return total, loaded
+
+
+if __name__ == "__main__":
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    env = dict(os.environ, PYTHONPATH=repo_root)
+    baseline = min(import_profile("pass", env)[0] for _ in range(REPEATS))
+    for label, statement in ENTRY_POINTS:
+        runs = [import_profile(statement, env) for _ in range(REPEATS)]
+        best = min(total for total, _ in runs) - baseline
+        heavy = [name for name in HEAVY_MODULES if name in runs[0][1]]
+        print(f"{label:45s} {best / 1000:7.1f} ms   heavy: {', '.join(heavy) or '-'}")
@@ -0,0 +1,68 @@
+"""
+Benchmark for pasting long number lists into the CLI: the original
+_safe_literal_eval versus the scanning parser and parse_numbers.
+
+Run from the repository root:
+    python -m mini_projects.day4.benchmarks.bench_parse
+"""
+
+import ast
+import random
+import time
+
+from mini_projects.day4.utility_toolkit import _safe_literal_eval, parse_numbers
+
+
+def legacy_safe_literal_eval(user_input: str):
+    """The original implementation, kept here as the baseline."""
+    try:
+        return ast.literal_eval(user_input)
+    except Exception:
+        tokens = user_input.strip().split()
+        if not tokens:
+            return []
+        if len(tokens) == 1:
+            tok = tokens[0]
+            for cast in (int, float):
+                try:
+                    return cast(tok)
+                except (ValueError, TypeError):
+                    continue
+            return tok
+        out = []
+        for t in tokens:
+            for cast in (int, float):
+                try:
+                    out.append(cast(t))
+                    break
+                except (ValueError, TypeError):
+                    continue
+            else:
+                out.append(t)
+        return out
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    n = 1_000_000
+    ints = [str(random.randint(-10**9, 10**9)) for _ in range(n)]
+    floats = [repr(random.uniform(-1e6, 1e6)) for _ in range(n)]
+    inputs = {
+        "ints, space-separated": " ".join(ints),
+        "ints, [a, b, ...]": "[" + ", ".join(ints) + "]",
+        "floats, space-separated": " ".join(floats),
+        "floats, [a, b, ...]": "[" + ", ".join(floats) + "]",
+    }
+    print(f"{n:,} numbers per input")
+    print(f"{'input':26s} {'legacy':>9s} {'_safe_literal_eval':>19s} {'parse_numbers':>14s}")
+    for label, text in inputs.items():
+        legacy = timed(legacy_safe_literal_eval, text)
+        new = timed(_safe_literal_eval, text)
+        direct = timed(parse_numbers, text)
+        print(f"{label:26s} {legacy:8.2f}s {new:18.2f}s {direct:13.2f}s")
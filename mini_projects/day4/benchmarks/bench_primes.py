@@ -0,0 +1,56 @@
+"""
+Benchmark for the prime engine in utility_toolkit.
+Compares per-call latency of is_prime against the original trial-division version
+at 10^6 and 10^12 scale, plus the batch APIs.
+
+Run from the repository root:
+    python -m mini_projects.day4.benchmarks.bench_primes
+"""
+
+import math
+import random
+import time
+
+from mini_projects.day4.utility_toolkit import is_prime, is_prime_many, primes_in_range
+
+
+def trial_division_is_prime(num: int) -> bool:
+    """The original odd-only trial division, kept here as the baseline."""
+    if num < 2:
+        return False
+    if num in (2, 3):
+        return True
+    if num % 2 == 0:
+        return False
+    for i in range(3, math.isqrt(num) + 1, 2):
+        if num % i == 0:
+            return False
+    return True
+
+
+def per_call_us(fn, values) -> float:
+    start = time.perf_counter()
+    for v in values:
+        fn(v)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    for scale, count in ((10**6, 100_000), (10**12, 200)):
+        values = [rng.randrange(scale, 2 * scale) for _ in range(count)]
+        is_prime(scale)  # warm the sieve, as a long-running caller would
+        base = per_call_us(trial_division_is_prime, values)
+        new = per_call_us(is_prime, values)
+        print(f"is_prime @ 10^{len(str(scale)) - 1}: trial division {base:9.2f} us/call, "
+              f"engine {new:7.2f} us/call ({base / new:6.1f}x)")
+
+    values = list(range(10**6, 2 * 10**6))
+    start = time.perf_counter()
+    is_prime_many(values)
+    print(f"is_prime_many over 10^6 values: {time.perf_counter() - start:.3f} s")
+
+    start = time.perf_counter()
+    found = primes_in_range(10**12, 10**12 + 10**6)
+    print(f"primes_in_range(10^12, 10^12 + 10^6): {len(found)} primes in "
+          f"{time.perf_counter() - start:.3f} s")
@@ -0,0 +1,60 @@
+"""
+Benchmark for calculate_stats in utility_toolkit.
+Compares the original multi-pass implementation with the single-pass accumulator
+on lists, generators and array('d') buffers, then scales calculate_stats_parallel
+over 1/2/4/8 workers on a memory-mapped binary file.
+
+Run from the repository root:
+    python -m mini_projects.day4.benchmarks.bench_stats
+"""
+
+import os
+import random
+import tempfile
+import time
+from array import array
+
+from mini_projects.day4.utility_toolkit import (
+    StatsAccumulator,
+    calculate_stats,
+    calculate_stats_parallel,
+)
+
+
+def multi_pass_stats(lst):
+    """The original implementation, kept here as the baseline."""
+    nums = list(lst)
+    for x in nums:
+        if not isinstance(x, (int, float)):
+            raise TypeError("all items must be int or float")
+    total = sum(nums)
+    return {"mean": total / len(nums), "min": min(nums), "max": max(nums),
+            "sum": total, "length": len(nums)}
+
+
+def timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    n = 5_000_000
+    rng = random.Random(1)
+    data = [rng.random() for _ in range(n)]
+    buf = array("d", data)
+    print(f"{n} float samples")
+    timed("baseline list", lambda: multi_pass_stats(data))
+    timed("calculate_stats list", lambda: calculate_stats(data))
+    timed("baseline generator", lambda: multi_pass_stats(x for x in data))
+    timed("calculate_stats generator", lambda: calculate_stats(x for x in data))
+    timed("calculate_stats array('d')", lambda: calculate_stats(buf))
+    timed("StatsAccumulator.from_buffer + variance", lambda: StatsAccumulator.from_buffer(buf).variance)
+
+    print(f"\ncalculate_stats_parallel on a {n * 8 // 2**20} MiB float64 file ({os.cpu_count()} CPUs)")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "samples.f64")
+        with open(path, "wb") as f:
+            buf.tofile(f)
+        for workers in (1, 2, 4, 8):
+            timed(f"workers={workers}", lambda: calculate_stats_parallel(path, workers=workers, chunk_size=1 << 20))
@@ -1,49 +1,74 @@
 """
 Simple script to read and pretty-print the utility_history.jsonl file.
-Requires utility_toolkit.py to have been executed at least once.
+Requires the utility_toolkit CLI to have been executed at least once.
+
+Uses the indexed HistoryReader, so --tail and --function only decode the
+matching lines even for a months-old log:
+    python read_history.py --tail 20
+    python read_history.py --function 3
 """
 
-import json
+import argparse
 from datetime import datetime
 import os
 
+from mini_projects.day4.utility_toolkit import HistoryReader
+
 HISTORY_FILE = "utility_history.jsonl"
 
 
-def pretty_print_history(filename: str):
-    """Reads a JSONL file and prints each entry in a human-readable format."""
+def print_entry(i, entry):
+    """Print one history entry in a human-readable format."""
+    if entry is None:
+        print(f"\n[{i}] Invalid JSON entry.")
+        return
+
+    timestamp_str = entry.get("ts", "N/A")
+    try:
+        dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+        formatted_ts = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+    except Exception:
+        formatted_ts = timestamp_str
+
+    status = "SUCCESS"
+    if "error" in entry:
+        status = f"ERROR: {entry['error']}"
+
+    print(f"\n[{i}] @ {formatted_ts}")
+    print(f"  Function #: {entry.get('function_number', 'N/A')}")
+    print(f"  Status: {status}")
+    print(f"  Output: {entry.get('output', entry.get('error', 'N/A'))}")
+
+
+def pretty_print_history(filename: str, tail=None, function_number=None):
+    """Prints entries of a JSONL history file, optionally only the last `tail` or one function's."""
     if not os.path.exists(filename):
         print(f"\nError: History file '{filename}' not found. Run the CLI first.")
         return
 
     print(f"--- Reading Utility History from {filename} ---")
 
-    with open(filename, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f, 1):
+    with HistoryReader(filename) as reader:
+        if function_number is not None:
+            rows = reader.by_function(function_number)
+            if tail is not None:
+                rows = rows[-tail:] if tail > 0 else []
+        elif tail is not None:
+            rows = reader.tail(tail)
+        else:
+            rows = reader.tail(len(reader))
+        for i, entry in rows:
             try:
-                entry = json.loads(line)
-
-                timestamp_str = entry.get("ts", "N/A")
-                try:
-                    dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                    formatted_ts = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-                except Exception:
-                    formatted_ts = timestamp_str
-
-                status = "SUCCESS"
-                if "error" in entry:
-                    status = f"ERROR: {entry['error']}"
-
-                print(f"\n[{i}] @ {formatted_ts}")
-                print(f"  Function #: {entry.get('function_number', 'N/A')}")
-                print(f"  Status: {status}")
-                print(f"  Output: {entry.get('output', entry.get('error', 'N/A'))}")
-
-            except json.JSONDecodeError:
-                print(f"\n[{i}] Invalid JSON entry.")
+                print_entry(i, entry)
             except Exception as e:
                 print(f"\n[{i}] Unexpected Error: {e}")
 
 
 if __name__ == "__main__":
-    pretty_print_history(HISTORY_FILE)
+    parser = argparse.ArgumentParser(description="Pretty-print the utility toolkit history log.")
+    parser.add_argument("filename", nargs="?", default=HISTORY_FILE)
+    parser.add_argument("--tail", type=int, help="only show the last N entries")
+    parser.add_argument("--function", type=int, dest="function_number",
+                        help="only show entries for this function number")
+    args = parser.parse_args()
+    pretty_print_history(args.filename, tail=args.tail, function_number=args.function_number)
@@ -1,31 +1,83 @@
 import unittest
 import tempfile
 import os
+import pickle
 import json
+import math
+import statistics
+import subprocess
+import sys
+import threading
+import warnings
+from array import array
 
 from mini_projects.day4.utility_toolkit import (
     is_prime,
+    is_prime_many,
+    primes_in_range,
     factorial,
+    factorial_mod,
+    binomial,
     fibonacci,
+    fibonacci_nth,
+    fibonacci_range,
+    iter_fibonacci,
     count_vowels,
     reverse_string,
     get_unique_elements,
+    iter_unique,
+    BloomFilter,
     merge_dicts,
+    merge_many,
+    deep_merge,
     calculate_stats,
+    StatsAccumulator,
+    calculate_stats_parallel,
     is_palindrome,
+    is_palindrome_file,
+    longest_palindromic_substring,
     gcd,
     lcm,
+    gcd_many,
+    lcm_many,
+    gcd_pairs,
     apply_discount,
+    apply_discount_many,
     clean_text,
     sentence_to_words,
+    tokenize_lines,
+    tokenize_file,
+    parse_numbers,
     _safe_literal_eval,
+    run_job,
+    run_batch,
+    run_jobs,
+    LatencyHistogram,
+    ResultCache,
+    enable_result_cache,
+    disable_result_cache,
+    save_result_cache,
+    main,
     save_history,
+    HistoryWriter,
+    HistoryReader,
+    get_history_writer,
+    close_history_writers,
+    iter_history,
     flatten_list,
+    iter_flatten,
     find_maximum,
+    top_k,
+    argmax,
+    argmin,
+    min_max,
 )
 
 class TestUtilityToolkit(unittest.TestCase):
-    """Test suite for the core functions in utility_toolkit.py."""
+    """Test suite for the core functions in the utility_toolkit package."""
+
+    def tearDown(self):
+        close_history_writers()  # save_history keeps its files open between calls
 
     # --- Math / numeric utilities ---
     def test_is_prime(self):
@@ -36,6 +88,46 @@ class TestUtilityToolkit(unittest.TestCase):
         with self.assertRaises(TypeError):
             is_prime(3.5)
 
+    def test_is_prime_large(self):
+        self.assertTrue(is_prime(1_000_003))
+        self.assertTrue(is_prime(2**61 - 1))
+        self.assertTrue(is_prime(18446744073709551557))  # largest 64-bit prime
+        self.assertFalse(is_prime(3215031751))  # strong pseudoprime to bases 2, 3, 5, 7
+        self.assertFalse(is_prime(10**12))
+        # Strong pseudoprime to the 12 prime bases up to 37: needs base 41.
+        self.assertFalse(is_prime(318665857834031151167461))
+        self.assertFalse(is_prime(3317044064679887385961981))  # ...and to 41: needs BPSW
+        self.assertTrue(is_prime(2**127 - 1))
+        self.assertFalse(is_prime((2**89 - 1) * (2**107 - 1)))
+
+    def test_prime_sieve_is_thread_safe(self):
+        from mini_projects.day4.utility_toolkit import math_utils
+
+        sieve = math_utils._PrimeSieve()
+        limits = [(i * 7919) % 3_000_000 + 2 for i in range(1, 400)]
+
+        def grow(chunk):
+            for limit in chunk:
+                sieve.extend(limit)
+
+        threads = [threading.Thread(target=grow, args=(limits[i::8],)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(sieve._flags), sieve.limit // 2)
+        self.assertEqual(sieve.primes(2_000_000, 2_000_200), primes_in_range(2_000_000, 2_000_200))
+
+    def test_prime_batch_apis(self):
+        self.assertEqual(primes_in_range(0, 30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(primes_in_range(10**12, 10**12 + 100), [1000000000039, 1000000000061, 1000000000063, 1000000000091])
+        self.assertEqual(primes_in_range(20, 10), [])
+        self.assertEqual(is_prime_many([1, 2, 9, 97, 2**31 - 1]), [False, True, False, True, True])
+        with self.assertRaises(TypeError):
+            is_prime_many([3, 4.0])
+        with self.assertRaises(TypeError):
+            primes_in_range(0, 10.5)
+
     def test_factorial(self):
         self.assertEqual(factorial(0), 1)
         self.assertEqual(factorial(5), 120)
@@ -44,12 +136,89 @@ class TestUtilityToolkit(unittest.TestCase):
         with self.assertRaises(TypeError):
             factorial(2.5)
 
+    def test_factorial_large_and_memo(self):
+        self.assertEqual(factorial(200), math.factorial(200))
+        self.assertEqual(factorial(201), math.factorial(201))  # resumes from 200!
+        self.assertEqual(factorial(150), math.factorial(150))
+
+        def compute(values):
+            for n in values:
+                self.assertEqual(factorial(n), math.factorial(n))
+
+        threads = [threading.Thread(target=compute, args=(range(i, 300, 7),)) for i in range(7)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def test_factorial_mod_and_binomial(self):
+        self.assertEqual(factorial_mod(10, 1000), 800)
+        self.assertEqual(factorial_mod(13, 13), 0)
+        self.assertEqual(binomial(10, 3), 120)
+        self.assertEqual(binomial(3, 5), 0)
+        self.assertEqual(binomial(1000, 500, mod=13), math.comb(1000, 500) % 13)
+        self.assertEqual(binomial(1000, 500, mod=12), math.comb(1000, 500) % 12)
+        with self.assertRaises(ValueError):
+            factorial_mod(5, 0)
+        with self.assertRaises(ValueError):
+            binomial(-1, 2)
+        with self.assertRaises(TypeError):
+            binomial(5, 2, mod=2.0)
+
     def test_gcd_lcm(self):
         self.assertEqual(gcd(48, 18), 6)
         self.assertEqual(lcm(15, 20), 60)
         with self.assertRaises(TypeError):
             gcd(3.5, 2)
 
+    def test_gcd_lcm_many(self):
+        self.assertEqual(gcd_many([48, -18, 30]), 6)
+        self.assertEqual(gcd_many(iter([0, 0])), 0)
+        self.assertEqual(gcd_many([]), 0)
+        self.assertEqual(lcm_many([4, 6, 10]), 60)
+        self.assertEqual(lcm_many([]), 1)
+        self.assertEqual(lcm_many([3, 0, 5]), 0)
+        self.assertEqual(gcd_many(array("q", range(0, 6000, 6)), chunk_size=7), 6)
+        self.assertEqual(gcd_many(range(6, 60000, 6), workers=2, chunk_size=1000), 6)
+        self.assertEqual(lcm_many(range(1, 21), workers=2, chunk_size=3), 232792560)
+        self.assertEqual(gcd_pairs([12, 7, 0], array("q", [18, 3, 5])), [6, 1, 5])
+        with self.assertRaises(TypeError):
+            gcd_many([4, 2.0])
+        with self.assertRaises(TypeError):
+            gcd_many(12)
+        with self.assertRaises(ValueError):
+            gcd_many([1], workers=0)
+        with self.assertRaises(ValueError):
+            gcd_pairs([1], [1, 2])
+
+    def test_apply_discount_many(self):
+        results, rejected = apply_discount_many([100, 50.0], 10)
+        self.assertEqual((list(results), rejected), ([90.0, 45.0], 0))
+        results, rejected = apply_discount_many(array("d", [100, 200]), array("d", [10, 50]))
+        self.assertEqual((list(results), rejected), ([90.0, 100.0], 0))
+        results, rejected = apply_discount_many([100, "x", 30, 40, 10], [10, 10, 150, float("nan"), 0])
+        self.assertEqual(rejected, 3)
+        self.assertEqual(results[0], 90.0)
+        self.assertEqual(results[4], 10.0)
+        self.assertTrue(all(math.isnan(x) for x in results[1:4]))
+        out = array("d", [0.0, 0.0])
+        self.assertIs(apply_discount_many([10, 20], [0, 100], out=out)[0], out)
+        self.assertEqual(list(out), [10.0, 0.0])
+        out = array("f", [0.0, 0.0, 0.0])
+        self.assertIs(apply_discount_many(array("d", [10, 20, 30]), 50, out=out)[0], out)
+        self.assertEqual(list(out), [5.0, 10.0, 15.0])
+        results, rejected = apply_discount_many([10, "x", 30], [10, 10, 200], out=out)
+        self.assertEqual((results[0], rejected), (9.0, 2))
+        self.assertTrue(math.isnan(out[1]) and math.isnan(out[2]))
+        with self.assertRaises(ValueError):
+            apply_discount_many([1, 2, 3], 5, out=array("d", [0.0, 0.0]))
+        with self.assertRaises(ValueError):
+            apply_discount_many([1, 2], 150)
+        with self.assertRaises(ValueError):
+            apply_discount_many([1, 2], [1])
+        with self.assertRaises(TypeError):
+            apply_discount_many([1], 5, out=array("q", [0]))
+
     def test_apply_discount(self):
         self.assertEqual(apply_discount(100, 10), 90.0)
         with self.assertRaises(ValueError):
@@ -65,12 +234,47 @@ class TestUtilityToolkit(unittest.TestCase):
         with self.assertRaises(TypeError):
             fibonacci(2.5)
 
+    def test_fibonacci_engine(self):
+        self.assertEqual([fibonacci_nth(i) for i in range(10)], fibonacci(10))
+        self.assertEqual(fibonacci_nth(100), 354224848179261915075)
+        self.assertEqual(fibonacci_range(10, 13), [55, 89, 144])
+        self.assertEqual(fibonacci_range(5, 5), [])
+        stream = iter_fibonacci(98)
+        self.assertEqual([next(stream), next(stream), next(stream)],
+                         fibonacci_range(98, 101))
+        with self.assertRaises(ValueError):
+            fibonacci_nth(-1)
+        with self.assertRaises(TypeError):
+            fibonacci_range(0, 2.5)
+
     def test_get_unique_elements(self):
         self.assertEqual(get_unique_elements([1, 2, 1, 3]), [1, 2, 3])
         self.assertEqual(get_unique_elements(("a", "b", "a")), ["a", "b"])
         with self.assertRaises(TypeError):
             get_unique_elements(123)
 
+    def test_iter_unique_exact_and_keyed(self):
+        stream = iter_unique(iter([3, 1, 3, 2, 1]))
+        self.assertEqual(next(stream), 3)
+        self.assertEqual(list(stream), [1, 2])
+        records = [{"id": 1, "v": "a"}, {"id": 2, "v": "b"}, {"id": 1, "v": "c"}]
+        self.assertEqual(get_unique_elements(records, key=lambda r: r["id"]), records[:2])
+        self.assertEqual(list(iter_unique(["a", "B", "A"], key=str.lower)), ["a", "B"])
+        with self.assertRaises(TypeError):
+            iter_unique(123)
+
+    def test_iter_unique_approximate(self):
+        data = [i % 500 for i in range(5000)]
+        out = list(iter_unique(data, approximate=True, capacity=500, error_rate=0.01))
+        self.assertEqual(len(out), len(set(out)))  # never yields duplicates
+        self.assertGreater(len(out), 480)
+        bloom = BloomFilter(1000, error_rate=0.01)
+        self.assertFalse(bloom.add("x"))
+        self.assertTrue(bloom.add("x"))
+        self.assertIn("x", bloom)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, error_rate=1.5)
+
     def test_merge_and_find_max_flatten(self):
         self.assertEqual(merge_dicts({'a': 1}, {'a': 2, 'b': 3})['a'], 2)
         self.assertEqual(find_maximum([1, 5, 3]), 5)
@@ -78,6 +282,60 @@ class TestUtilityToolkit(unittest.TestCase):
             find_maximum([])
         self.assertEqual(flatten_list([1, [2, (3, 4)], 5]), [1, 2, 3, 4, 5])
 
+    def test_merge_many_and_deep_merge(self):
+        base = {"x": 1, "db": {"host": "a", "port": 1, "opts": {"t": 1}}, "log": {"level": "info"}}
+        view = merge_many(base, {"db": {"port": 2}}, {"x": 3})
+        self.assertEqual((view["x"], view["db"], list(view)), (3, {"port": 2}, ["x", "db", "log"]))
+        self.assertEqual(dict(view), merge_many(base, {"db": {"port": 2}}, {"x": 3}, lazy=False))
+        view["new"] = 1
+        self.assertNotIn("new", base)
+
+        merged = deep_merge(base, {"db": {"port": 2}}, {"x": 3})
+        self.assertEqual(merged, {"x": 3, "db": {"host": "a", "port": 2, "opts": {"t": 1}},
+                                  "log": {"level": "info"}})
+        self.assertEqual(base["db"]["port"], 1)  # inputs untouched
+        self.assertIs(merged["log"], base["log"])  # unchanged subtrees are shared
+        self.assertIs(merged["db"]["opts"], base["db"]["opts"])
+        self.assertEqual(deep_merge({"a": {"b": 1}}, {"a": 5}), {"a": 5})
+        self.assertIsNot(deep_merge(base), base)
+        with self.assertRaises(TypeError):
+            merge_many({}, [("a", 1)])
+        with self.assertRaises(TypeError):
+            deep_merge({}, None)
+
+    def test_top_k_argmax_min_max(self):
+        self.assertEqual(top_k(iter([5, 1, 9, 3, 9]), 3), [9, 9, 5])
+        self.assertEqual(top_k(["bb", "a", "cc"], 2, key=len), ["bb", "cc"])
+        self.assertEqual(top_k([1, 2], 0), [])
+        self.assertEqual(argmax([3, 9, 2, 9]), (1, 9))
+        self.assertEqual(argmin(iter([3, 1, 2, 1])), (1, 1))
+        self.assertEqual(argmax(["x", "yyy", "zz"], key=len), (1, "yyy"))
+        self.assertEqual(min_max([3, 1, 2]), (1, 3))
+        self.assertEqual(min_max(iter([4, 1.0, 7, 1, 7.0])), (1.0, 7))  # first of equal items
+        self.assertEqual(min_max(["ccc", "a", "bb"], key=len), ("a", "ccc"))
+        for fn in (argmax, argmin, min_max):
+            with self.assertRaises(ValueError):
+                fn([])
+            with self.assertRaises(TypeError):
+                fn(5)
+        with self.assertRaises(ValueError):
+            top_k([1], -1)
+
+    def test_flatten_depth_and_leaves(self):
+        nested = [1, [2, (3, [4])], "ab", array("d", [1.0]), []]
+        self.assertEqual(flatten_list(nested), [1, 2, 3, 4, "ab", array("d", [1.0])])
+        self.assertEqual(flatten_list(nested, max_depth=1), [1, 2, (3, [4]), "ab", array("d", [1.0])])
+        self.assertEqual(list(iter_flatten(nested, max_depth=2)), [1, 2, 3, [4], "ab", array("d", [1.0])])
+        self.assertEqual(list(iter_flatten(iter(nested))), flatten_list(nested))
+        deep = current = []
+        for i in range(5000):  # far beyond the default recursion limit
+            current.append([i])
+            current = current[-1]
+        self.assertEqual(len(flatten_list(deep)), 5000)
+        self.assertEqual(sum(1 for _ in iter_flatten(deep)), 5000)
+        with self.assertRaises(ValueError):
+            flatten_list(nested, max_depth=-1)
+
     def test_calculate_stats(self):
         stats = calculate_stats([10, 20, 30])
         expected = {"mean": 20.0, "min": 10, "max": 30, "sum": 60, "length": 3}
@@ -87,6 +345,55 @@ class TestUtilityToolkit(unittest.TestCase):
         with self.assertRaises(TypeError):
             calculate_stats([1, "a"])
 
+    def test_calculate_stats_streams_and_buffers(self):
+        expected = {"mean": 20.0, "min": 10, "max": 30, "sum": 60, "length": 3}
+        self.assertEqual(calculate_stats(x for x in [10, 20, 30]), expected)
+        self.assertEqual(calculate_stats(array("q", [10, 20, 30])), expected)
+        self.assertEqual(calculate_stats(memoryview(array("d", [1.5, 2.5]))),
+                         {"mean": 2.0, "min": 1.5, "max": 2.5, "sum": 4.0, "length": 2})
+        with self.assertRaises(ValueError):
+            calculate_stats(iter([]))
+        with self.assertRaises(TypeError):
+            calculate_stats(array("u", "ab"))
+
+    def test_stats_accumulator_update_and_merge(self):
+        data = [2.5, 7.0, -1.0, 4.0, 9.5, 3.0]
+        single = StatsAccumulator()
+        for x in data:
+            single.update(x)
+        left, right = StatsAccumulator(), StatsAccumulator()
+        left.update_many(data[:2])
+        right.update_many(iter(data[2:]))
+        merged = left.merge(right)
+        for acc in (single, merged, StatsAccumulator.from_buffer(array("d", data))):
+            self.assertEqual(acc.count, 6)
+            self.assertEqual((acc.min, acc.max), (-1.0, 9.5))
+            self.assertAlmostEqual(acc.mean, statistics.mean(data))
+            self.assertAlmostEqual(acc.variance, statistics.pvariance(data))
+        with self.assertRaises(TypeError):
+            single.update("x")
+        with self.assertRaises(ValueError):
+            StatsAccumulator().mean
+
+    def test_calculate_stats_parallel(self):
+        data = [float(i % 97) for i in range(5000)]
+        expected = calculate_stats(data)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "samples.f64")
+            with open(fname, "wb") as f:
+                array("d", data).tofile(f)
+            for source in (data, array("d", data), fname):
+                stats = calculate_stats_parallel(source, workers=2, chunk_size=700)
+                self.assertEqual(stats["length"], 5000)
+                self.assertEqual((stats["min"], stats["max"]), (expected["min"], expected["max"]))
+                self.assertAlmostEqual(stats["mean"], expected["mean"])
+                self.assertAlmostEqual(stats["variance"], statistics.pvariance(data))
+                self.assertAlmostEqual(stats["stddev"] ** 2, stats["variance"])
+        with self.assertRaises(ValueError):
+            calculate_stats_parallel([], workers=1)
+        with self.assertRaises(ValueError):
+            calculate_stats_parallel(data, workers=0)
+
     # --- String utilities ---
     def test_string_utilities(self):
         self.assertEqual(count_vowels("Hello World"), 3)
@@ -95,12 +402,51 @@ class TestUtilityToolkit(unittest.TestCase):
         with self.assertRaises(TypeError):
             count_vowels(123)
 
+    def test_palindrome_two_pointer_and_file(self):
+        text = "Never odd or even. " * 5000
+        self.assertTrue(is_palindrome(text[:-1] + "N" + text[::-1]))
+        self.assertFalse(is_palindrome("x" + text + text[::-1]))
+        self.assertTrue(is_palindrome("Été, ÉTÉ!"))
+        self.assertTrue(is_palindrome(",.!"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "pal.txt")
+            for content, expected in ((text + text[::-1], True), ("Été, ÉTÉ!", True),
+                                      ("", True), ("abc" * 10000, False)):
+                with open(fname, "w", encoding="utf-8") as f:
+                    f.write(content)
+                self.assertEqual(is_palindrome_file(fname), expected)
+
+    def test_longest_palindromic_substring(self):
+        self.assertEqual(longest_palindromic_substring("babad"), "bab")
+        self.assertEqual(longest_palindromic_substring("cbbd"), "bb")
+        self.assertEqual(longest_palindromic_substring("xx$#$#yy"), "$#$")
+        self.assertEqual(longest_palindromic_substring(""), "")
+        self.assertEqual(longest_palindromic_substring("ab" * 500 + "racecar"), "ab" * 499 + "a")
+        with self.assertRaises(TypeError):
+            longest_palindromic_substring(None)
+
     def test_palindrome_and_sentence(self):
         self.assertTrue(is_palindrome("A man, a plan, a canal: Panama"))
         self.assertFalse(is_palindrome("abc"))
         self.assertEqual(sentence_to_words("  The quick, brown fox "),
                          ["the", "quick", "brown", "fox"])
 
+    def test_tokenize_lines_and_file(self):
+        self.assertEqual(list(tokenize_lines(["Hello, World!", "foo-bar  baz"])),
+                         ["hello", "world", "foobar", "baz"])
+        text = "The quick, brown fox.\nJumps over the lazy-dog! " * 50
+        expected = sentence_to_words(text)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "corpus.txt")
+            with open(fname, "w", encoding="utf-8") as f:
+                f.write(text)
+            for chunk_size in (1, 5, 64, 1 << 20):  # words split across every boundary
+                self.assertEqual(list(tokenize_file(fname, chunk_size=chunk_size)), expected)
+        with self.assertRaises(TypeError):
+            list(tokenize_lines(["ok", 3]))
+        with self.assertRaises(ValueError):
+            tokenize_file("unused.txt", chunk_size=0)
+
     # --- Safe literal eval parsing ---
     def test_safe_literal_eval(self):
         self.assertEqual(_safe_literal_eval("[1, 2, 3]"), [1, 2, 3])
@@ -109,6 +455,131 @@ class TestUtilityToolkit(unittest.TestCase):
         self.assertEqual(_safe_literal_eval("hello"), "hello")
         self.assertEqual(_safe_literal_eval(""), [])
 
+    def test_numeric_list_parsing(self):
+        self.assertEqual(_safe_literal_eval("[1, -2, 3.5, 1e3,]"), [1, -2, 3.5, 1000.0])
+        self.assertEqual(_safe_literal_eval("1 +2 01"), [1, 2, 1])  # int() rules when space-separated
+        self.assertEqual(_safe_literal_eval("[01, 2]"), ["[01,", "2]"])  # not a Python literal
+        self.assertEqual(_safe_literal_eval("(1, 2)"), (1, 2))
+        self.assertEqual(_safe_literal_eval("1 inf"), [1, float("inf")])
+        self.assertEqual(parse_numbers("[1, 2, 3]"), array("q", [1, 2, 3]))
+        self.assertEqual(parse_numbers("1 2.5\n-3"), array("d", [1.0, 2.5, -3.0]))
+        self.assertEqual(parse_numbers("(4, 5)", typecode="d"), array("d", [4.0, 5.0]))
+        self.assertEqual(parse_numbers(f"{2 ** 70} 1").typecode, "d")
+        with self.assertRaises(ValueError):
+            parse_numbers("1 two 3")
+        with self.assertRaises(ValueError):
+            parse_numbers("[1,, 2]")
+        for text in ("[1 2,,]", "[, 3 4]", "[1,,2]"):  # errors that must not cancel out
+            with self.assertRaises(ValueError):
+                parse_numbers(text)
+        with self.assertRaises(ValueError):
+            parse_numbers("1.5 2", typecode="q")
+
+    # --- Batch mode ---
+    def test_run_job(self):
+        self.assertEqual(run_job({"fn": "gcd", "args": [48, 18]}),
+                         {"fn": "gcd", "function_number": 12, "result": 6})
+        self.assertEqual(run_job({"fn": 2, "args": [5]})["result"], 120)
+        self.assertEqual(run_job({"fn": "factorial", "args": [-1]})["error"],
+                         "Factorial is not defined for negative numbers.")
+        self.assertIn("error", run_job({"fn": "eval", "args": ["1"]}))
+        self.assertIn("error", run_job(["not", "a", "dict"]))
+
+    def test_run_batch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jobs = os.path.join(tmpdir, "jobs.jsonl")
+            out = os.path.join(tmpdir, "out.jsonl")
+            history = os.path.join(tmpdir, "history.jsonl")
+            with open(jobs, "w", encoding="utf-8") as f:
+                f.write('{"fn": "is_prime", "args": [97]}\n\nnot json\n')
+                f.write('{"fn": "merge_dicts", "args": [{"a": 1}, {"a": 2}]}\n')
+            self.assertEqual(run_batch(jobs, output=out, history_file=history), {"ok": 2, "failed": 1})
+            with open(out, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([r["line"] for r in records], [1, 3, 4])
+            self.assertEqual(records[2]["result"], {"a": 2})
+            with open(history, encoding="utf-8") as f:
+                logged = [json.loads(line) for line in f]
+            self.assertEqual([e.get("function_number") for e in logged], [1, None, 7])
+            self.assertEqual(main(["--batch", jobs, "--output", out, "--no-history"]), 2)
+
+    def test_run_jobs_process_pool(self):
+        jobs = [{"fn": "is_prime", "args": [n]} for n in range(40)]
+        jobs += [{"fn": "factorial", "args": [-1]}, {"fn": "lcm", "args": [4, 6]}]
+        records, latency = run_jobs(jobs, workers=2, chunk_size=5)
+        self.assertEqual([r["index"] for r in records], list(range(42)))
+        self.assertEqual([r["result"] for r in records[:8]], [False, False, True, True, False, True, False, True])
+        self.assertEqual(records[40]["error"], "Factorial is not defined for negative numbers.")
+        self.assertEqual(records[41]["result"], 12)
+        self.assertEqual(latency["is_prime"].count, 40)
+        self.assertEqual(sum(h.count for h in latency.values()), 42)
+        unordered, _ = run_jobs(jobs, workers=2, ordered=False, chunk_size=5)
+        self.assertEqual(sorted(r["index"] for r in unordered), list(range(42)))
+        with self.assertRaises(ValueError):
+            run_jobs(jobs, workers=0)
+
+    def test_latency_histogram(self):
+        hist = LatencyHistogram()
+        for us in (3, 5, 5, 100):
+            hist.add(us / 1e6)
+        self.assertEqual(hist.buckets, {4: 1, 8: 2, 128: 1})
+        self.assertAlmostEqual(hist.percentile(50), 8e-6)
+        other = LatencyHistogram()
+        other.add(0.5e-6)
+        self.assertEqual(hist.merge(other).count, 5)
+        self.assertEqual(hist.buckets[1], 1)
+
+    # --- Result cache ---
+    def test_result_cache_lru_ttl_and_counters(self):
+        cached = ResultCache(is_prime, maxsize=2)
+        self.assertEqual([cached(7), cached(7), cached(8), cached(9), cached(7)], [True, True, False, False, True])
+        self.assertEqual(cached.stats(), {"hits": 1, "misses": 4, "evictions": 2,
+                                          "expirations": 0, "skipped": 0, "size": 2})
+        with self.assertRaises(TypeError):
+            cached(7.0)  # argument types are part of the key
+        expiring = ResultCache(gcd, ttl=-1)
+        expiring(4, 6)
+        expiring(4, 6)
+        self.assertEqual((expiring.hits, expiring.expirations), (0, 1))
+
+    def test_result_cache_unhashable_inputs(self):
+        cached = ResultCache(get_unique_elements)
+        first = cached([1, 1, 2])
+        first.append(99)  # must not leak into the cache
+        self.assertEqual(cached([1, 1, 2]), [1, 2])
+        self.assertEqual(cached.hits, 1)
+        self.assertEqual(cached(x for x in [3, 3]), [3])
+        self.assertEqual(cached.skipped, 1)
+        typed = ResultCache(find_maximum)
+        self.assertIs(type(typed((1, 2.0))), float)
+        self.assertIs(type(typed((1.0, 2))), int)  # element types are part of the key
+        self.assertEqual(typed.hits, 0)
+        self.assertIs(type(typed(frozenset({2.0}))), float)
+        self.assertIs(type(typed(frozenset({2}))), int)
+        skipping = ResultCache(find_maximum, unhashable="skip")
+        self.assertEqual(skipping([1, 5, 3]), 5)
+        self.assertEqual(skipping.stats()["skipped"], 1)
+
+    def test_result_cache_registry_persistence(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                caches = enable_result_cache(["gcd"], cache_dir=tmpdir)
+                self.assertEqual(run_job({"fn": "gcd", "args": [12, 18]})["result"], 6)
+                save_result_cache(tmpdir)
+                disable_result_cache()
+                warmed = enable_result_cache(["gcd"], cache_dir=tmpdir)["gcd"]
+                self.assertEqual(len(warmed), 1)
+                self.assertEqual(run_job({"fn": "gcd", "args": [12, 18]})["result"], 6)
+                self.assertEqual((warmed.hits, warmed.misses), (1, 0))
+                self.assertEqual(caches["gcd"].misses, 1)
+            finally:
+                disable_result_cache()
+            with self.assertRaises(ValueError):
+                ResultCache(lcm).load(os.path.join(tmpdir, "gcd.cache"))
+            with open(os.path.join(tmpdir, "old.cache"), "wb") as f:
+                pickle.dump({"version": 1, "function": "gcd", "entries": [(((12, 18),), 0, math.inf)]}, f)
+            self.assertEqual(ResultCache(gcd).load(os.path.join(tmpdir, "old.cache")), 0)
+
     # --- History logging ---
     def test_save_history(self):
         entry = {"function": "is_prime", "input": 7, "output": True}
@@ -123,6 +594,191 @@ class TestUtilityToolkit(unittest.TestCase):
             self.assertEqual(parsed["function"], "is_prime")
             self.assertEqual(parsed["input"], 7)
 
+    def test_history_writer_buffers_and_flushes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "buffered.jsonl")
+            with HistoryWriter(fname, max_entries=3, flush_interval=3600) as writer:
+                writer.write({"n": 1})
+                writer.write({"n": 2})
+                self.assertFalse(os.path.exists(fname))  # still buffered
+                writer.write({"n": 3})  # hits max_entries
+                with open(fname, "r", encoding="utf-8") as f:
+                    self.assertEqual(len(f.read().splitlines()), 3)
+                writer.write({"n": 4})
+            with open(fname, "r", encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+            self.assertEqual([e["n"] for e in entries], [1, 2, 3, 4])
+            self.assertTrue(all("ts" in e for e in entries))
+            with self.assertRaises(ValueError):
+                writer.write({"n": 5})
+
+    def test_history_reader_index_queries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "history.jsonl")
+            with open(fname, "w", encoding="utf-8") as f:
+                for day in range(1, 7):
+                    f.write(json.dumps({"function_number": day % 2, "output": day,
+                                        "ts": f"2025-01-0{day}T12:00:00Z"}) + "\n")
+                f.write("not json\n")
+            with HistoryReader(fname) as reader:
+                self.assertEqual(len(reader), 7)
+                self.assertEqual(reader.tail(2), [(6, reader.entry(6)), (7, None)])
+                self.assertEqual([e["output"] for _, e in reader.by_function(1)], [1, 3, 5])
+                self.assertEqual([n for n, _ in reader.between("2025-01-02", "2025-01-04")], [2, 3])
+            self.assertTrue(os.path.exists(fname + ".idx"))
+
+            with open(fname, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"function_number": 9, "output": "new"}) + "\n")
+            with HistoryReader(fname) as reader:  # reuses the sidecar, indexes only the new line
+                self.assertEqual(len(reader), 8)
+                self.assertEqual(reader.by_function(9)[0][1]["output"], "new")
+                save_history({"function_number": 9, "output": "newer"}, filename=fname)
+                self.assertEqual(reader.refresh(), 1)
+                self.assertEqual(reader.tail(1)[0][1]["output"], "newer")
+
+    def test_history_reader_rebuilds_index_for_replaced_log(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "h.jsonl")
+
+            def write_log(function_number):
+                with open(fname, "w", encoding="utf-8") as f:
+                    for i in range(3):
+                        f.write(json.dumps({"function_number": function_number, "output": i}) + "\n")
+
+            write_log(1)
+            with HistoryReader(fname) as reader:
+                self.assertEqual(len(reader.by_function(1)), 3)
+            os.remove(fname)
+            write_log(2)  # same line lengths, and often the same inode
+            with HistoryReader(fname) as reader:
+                self.assertEqual(reader.by_function(1), [])
+                self.assertEqual([e["output"] for _, e in reader.by_function(2)], [0, 1, 2])
+
+    def test_history_reader_drops_partial_index_record(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "h.jsonl")
+
+            def append_log(numbers):
+                with open(fname, "a", encoding="utf-8") as f:
+                    for number in numbers:
+                        f.write(json.dumps({"function_number": number}) + "\n")
+
+            append_log([1, 2, 3])
+            HistoryReader(fname).close()
+            full_size = os.path.getsize(fname + ".idx")
+            with open(fname + ".idx", "ab") as f:
+                f.write(b"\x01" * 5)  # torn write of a fourth record
+            append_log([4, 5])
+            HistoryReader(fname).close()  # indexes lines 4 and 5 into the sidecar
+            self.assertEqual(os.path.getsize(fname + ".idx"), full_size + 2 * 24)  # two whole 24-byte records
+            with HistoryReader(fname) as reader:
+                self.assertEqual(len(reader), 5)
+                self.assertEqual([n for n, _ in reader.by_function(5)], [5])
+
+    def test_history_rotation_and_retention(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "history.jsonl")
+            writer = get_history_writer(fname, rotate_bytes=120, backup_count=2)
+            for i in range(30):
+                save_history({"function_number": 1, "output": i, "ts": "t"}, filename=fname)
+            writer.close()
+            names = sorted(os.listdir(tmpdir))
+            self.assertEqual(names, ["history.jsonl", "history.jsonl.1.gz", "history.jsonl.2.gz"])
+            outputs = [entry["output"] for entry in iter_history(fname)]
+            self.assertEqual(outputs, list(range(outputs[0], 30)))  # ordered, oldest dropped
+            self.assertGreater(outputs[0], 0)
+            with open(fname, encoding="utf-8") as f:
+                current_lines = len(f.readlines())
+            self.assertEqual([e["output"] for e in iter_history(fname, include_rotated=False)],
+                             outputs[-current_lines:])
+
+    def test_history_rotation_counts_encoded_bytes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "history.jsonl")
+            writer = HistoryWriter(fname, max_entries=1, rotate_bytes=300, backup_count=10, compress=False)
+            for i in range(10):
+                writer.write({"output": "日本語" * 10, "n": i, "ts": "t"})  # ~120 bytes, ~60 characters
+            writer.close()
+            names = os.listdir(tmpdir)
+            self.assertGreater(len(names), 3)
+            for name in names:
+                self.assertLessEqual(os.path.getsize(os.path.join(tmpdir, name)), 300)
+            self.assertEqual([e["n"] for e in iter_history(fname)], list(range(10)))
+
+    def test_history_rotation_interval_uses_file_age(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "history.jsonl")
+            with open(fname, "w", encoding="utf-8") as f:  # left behind by an earlier process
+                f.write(json.dumps({"output": "old", "ts": "2000-01-01T00:00:00Z"}) + "\n")
+            with HistoryWriter(fname, max_entries=1, rotate_interval=3600, compress=False) as writer:
+                writer.write({"output": "new"})
+                writer.write({"output": "newer"})  # the fresh segment is not due yet
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["history.jsonl", "history.jsonl.1"])
+            self.assertEqual([e["output"] for e in iter_history(fname)], ["old", "new", "newer"])
+
+    def test_history_backup_count_zero_disables_rotation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "history.jsonl")
+            with HistoryWriter(fname, max_entries=1, rotate_bytes=50, rotate_interval=0, backup_count=0) as writer:
+                for i in range(5):
+                    writer.write({"n": i})
+            self.assertEqual(os.listdir(tmpdir), ["history.jsonl"])
+            self.assertEqual([e["n"] for e in iter_history(fname)], list(range(5)))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_forked_child_releases_inherited_writers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "history.jsonl")
+            writer = HistoryWriter(fname, max_entries=100)
+            writer.write({"n": 1})
+            writer.flush()  # opens the file
+            writer.write({"n": 2})  # still buffered when the child is forked
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                pid = os.fork()
+                if pid == 0:  # child: report through the exit code only
+                    import gc
+                    gc.collect()
+                    clean = not caught and writer._file is None and not writer._buffer
+                    os._exit(0 if clean else 1)
+                _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.WEXITSTATUS(status), 0)
+            writer.close()
+            with open(fname, encoding="utf-8") as f:
+                self.assertEqual([json.loads(line)["n"] for line in f], [1, 2])
+
+    def test_shared_history_writers_are_bounded(self):
+        from mini_projects.day4.utility_toolkit import history
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            names = [os.path.join(tmpdir, f"h{i}.jsonl") for i in range(history._MAX_SHARED_WRITERS + 3)]
+            writers = [get_history_writer(name) for name in names]
+            self.assertEqual([w.closed for w in writers[:3]], [True] * 3)  # least recently used
+            self.assertFalse(any(w.closed for w in writers[3:]))
+            save_history({"n": 1}, filename=names[0])  # reopened on demand
+            self.assertTrue(writers[3].closed)
+            close_history_writers()
+            self.assertTrue(all(w.closed for w in writers))
+            with open(names[0], encoding="utf-8") as f:
+                self.assertEqual(json.loads(f.read())["n"], 1)
+
+    def test_save_history_ignores_write_errors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "missing_dir", "history.jsonl")
+            save_history({"function": "gcd"}, filename=fname)
+            self.assertFalse(os.path.exists(fname))
+
+    # --- Packaging ---
+    def test_math_import_stays_lightweight(self):
+        repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+        for name in ("gcd", "clean_text", "find_maximum"):  # math_utils, text_utils, collection_utils
+            code = (f"import sys; from mini_projects.day4.utility_toolkit import {name}; "
+                    "print(' '.join(m for m in ('json', 'ast', 'datetime', 'typing', 'string', "
+                    "'threading', 'concurrent.futures') if m in sys.modules))")
+            proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                  env=dict(os.environ, PYTHONPATH=repo_root), check=True)
+            self.assertEqual(proc.stdout.strip(), "", name)
+
 if __name__ == "__main__":
     unittest.main()
 
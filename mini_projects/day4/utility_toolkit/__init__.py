@@ -0,0 +1,109 @@
+"""
+Utility Toolkit - Day 4
+Safe, minimal, and production-aware implementations of common helpers.
+Includes robust input validation, safe CLI parsing, and JSONL history logging.
+
+The helpers live in submodules (math_utils, text_utils, collection_utils, history,
+batch, cli) and are re-exported here lazily (PEP 562): `from utility_toolkit import gcd`
+only imports math_utils, so json, datetime, threading, concurrent.futures and friends
+are loaded by the first call that actually needs them.
+"""
+
+# Submodule -> names it provides through this package.
+_EXPORTS = {
+    "math_utils": (
+        "is_prime",
+        "is_prime_many",
+        "primes_in_range",
+        "factorial",
+        "factorial_mod",
+        "binomial",
+        "fibonacci",
+        "fibonacci_nth",
+        "iter_fibonacci",
+        "fibonacci_range",
+        "gcd",
+        "lcm",
+        "gcd_many",
+        "lcm_many",
+        "gcd_pairs",
+        "apply_discount",
+        "apply_discount_many",
+    ),
+    "text_utils": (
+        "count_vowels",
+        "reverse_string",
+        "is_palindrome",
+        "is_palindrome_file",
+        "longest_palindromic_substring",
+        "clean_text",
+        "sentence_to_words",
+        "tokenize_lines",
+        "tokenize_file",
+        "parse_numbers",
+    ),
+    "collection_utils": (
+        "Number",
+        "get_unique_elements",
+        "iter_unique",
+        "BloomFilter",
+        "merge_dicts",
+        "merge_many",
+        "deep_merge",
+        "find_maximum",
+        "top_k",
+        "argmax",
+        "argmin",
+        "min_max",
+        "flatten_list",
+        "iter_flatten",
+        "calculate_stats",
+        "calculate_stats_parallel",
+        "StatsAccumulator",
+    ),
+    "history": (
+        "save_history",
+        "HistoryWriter",
+        "get_history_writer",
+        "close_history_writers",
+        "HistoryReader",
+        "iter_history",
+    ),
+    "batch": (
+        "FUNCTION_REGISTRY",
+        "PURE_FUNCTIONS",
+        "run_job",
+        "iter_batch",
+        "run_batch",
+        "run_jobs",
+        "iter_jobs",
+        "LatencyHistogram",
+        "ResultCache",
+        "enable_result_cache",
+        "save_result_cache",
+        "disable_result_cache",
+    ),
+    "cli": (
+        "main",
+        "_safe_literal_eval",
+    ),
+}
+
+_LOCATIONS = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = [name for name in _LOCATIONS if not name.startswith("_")]
+
+
+def __getattr__(name):
+    module_name = _LOCATIONS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LOCATIONS))
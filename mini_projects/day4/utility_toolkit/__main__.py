@@ -0,0 +1,7 @@
+"""Allow `python -m mini_projects.day4.utility_toolkit` (interactive menu or --batch)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,498 @@
+"""
+Utility Toolkit - function registry, JSONL batch runs, process-pool jobs and result cache.
+"""
+
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, abc
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .collection_utils import (
+    _iter_blocks,
+    _run_bounded,
+    calculate_stats,
+    find_maximum,
+    flatten_list,
+    get_unique_elements,
+    merge_dicts,
+)
+from .history import HistoryWriter
+from .math_utils import apply_discount, factorial, fibonacci, gcd, is_prime, lcm
+from .text_utils import clean_text, count_vowels, is_palindrome, reverse_string, sentence_to_words
+
+
+# -----------------------------
+# Batch mode (JSONL job files)
+# -----------------------------
+# CLI order: a function's number in the interactive menu is its position + 1.
+FUNCTION_REGISTRY: Dict[str, Callable[..., Any]] = {
+    "is_prime": is_prime,
+    "factorial": factorial,
+    "fibonacci": fibonacci,
+    "count_vowels": count_vowels,
+    "reverse_string": reverse_string,
+    "get_unique_elements": get_unique_elements,
+    "merge_dicts": merge_dicts,
+    "find_maximum": find_maximum,
+    "flatten_list": flatten_list,
+    "calculate_stats": calculate_stats,
+    "is_palindrome": is_palindrome,
+    "gcd": gcd,
+    "lcm": lcm,
+    "apply_discount": apply_discount,
+    "clean_text": clean_text,
+    "sentence_to_words": sentence_to_words,
+}
+_FUNCTION_NAMES = list(FUNCTION_REGISTRY)
+
+
+# -----------------------------
+# Result cache (opt-in memoization)
+# -----------------------------
+PURE_FUNCTIONS = (
+    "is_prime",
+    "factorial",
+    "gcd",
+    "lcm",
+    "is_palindrome",
+    "count_vowels",
+    "find_maximum",
+    "get_unique_elements",
+)
+_MISSING = object()
+_CACHE_FORMAT = 2  # bumped when the key layout changes; older save() files are not loaded
+
+
+def _typed(value: Any) -> Any:
+    """value paired with its type, recursing into tuples and frozensets, so (1, 2.0) and (1.0, 2) differ."""
+    if isinstance(value, tuple):
+        return (type(value), tuple(map(_typed, value)))
+    if isinstance(value, frozenset):
+        return (frozenset, frozenset(map(_typed, value)))
+    return (type(value), value)
+
+
+class ResultCache:
+    """
+    LRU memo for a pure function with optional TTL (seconds) and hit/miss/eviction counters.
+    Keys include argument types (and element types inside tuples and frozensets), so
+    is_prime(1.0) still raises instead of reusing is_prime(1).
+    Unhashable arguments (lists, dicts) are fingerprinted from their pickle when
+    unhashable="fingerprint", or bypass the cache when unhashable="skip"; iterators and
+    arguments that cannot be pickled always bypass it. Exceptions are never cached.
+    List/dict/set results are returned as shallow copies so callers cannot mutate the cache.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        unhashable: str = "fingerprint",
+    ) -> None:
+        if not callable(fn):
+            raise TypeError("fn must be callable")
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        if unhashable not in ("fingerprint", "skip"):
+            raise ValueError('unhashable must be "fingerprint" or "skip"')
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.unhashable = unhashable
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()  # key -> (result, expires_at)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.skipped = 0
+
+    def _key(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        if any(isinstance(a, abc.Iterator) for a in args) or any(
+            isinstance(v, abc.Iterator) for v in kwargs.values()
+        ):
+            return _MISSING  # single-use and hashed by identity: never cacheable
+        key = (tuple(map(_typed, args)), tuple(sorted((k, _typed(v)) for k, v in kwargs.items())))
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            pass
+        if self.unhashable == "skip":
+            return _MISSING
+        import hashlib
+        import pickle
+
+        try:
+            payload = pickle.dumps((args, sorted(kwargs.items())), protocol=4)
+        except Exception:
+            return _MISSING
+        return ("#fingerprint", hashlib.blake2b(payload, digest_size=16).digest())
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = self._key(args, kwargs)
+        if key is _MISSING:
+            with self._lock:
+                self.skipped += 1
+            return self.fn(*args, **kwargs)
+        now = time.time()
+        with self._lock:
+            found = self._entries.get(key, _MISSING)
+            if found is not _MISSING:
+                result, expires_at = found
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy_result(result)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        result = self.fn(*args, **kwargs)
+        self._store(key, _copy_result(result), math.inf if self.ttl is None else now + self.ttl)
+        return result
+
+    def _store(self, key: Any, result: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "skipped": self.skipped,
+            "size": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path: str) -> None:
+        """Persist unexpired entries (pickle; only load files you wrote yourself)."""
+        now = time.time()
+        with self._lock:
+            entries = [(k, v, exp) for k, (v, exp) in self._entries.items() if exp > now]
+        import pickle
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": _CACHE_FORMAT, "function": self.fn.__qualname__, "entries": entries}, f, protocol=4)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> int:
+        """
+        Warm the cache from a save() file for the same function; return entries loaded.
+        Files written with an older key layout are ignored (0 entries).
+        """
+        import pickle
+
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if not isinstance(data, dict) or data.get("function") != self.fn.__qualname__:
+            raise ValueError("cache file does not belong to this function")
+        if data.get("version") != _CACHE_FORMAT:
+            return 0
+        now = time.time()
+        loaded = 0
+        for key, value, expires_at in data["entries"]:
+            if expires_at > now:
+                self._store(key, value, expires_at)
+                loaded += 1
+        return loaded
+
+
+def _copy_result(result: Any) -> Any:
+    return result.copy() if isinstance(result, (list, dict, set)) else result
+
+
+def enable_result_cache(
+    functions: Iterable[str] = PURE_FUNCTIONS,
+    maxsize: int = 1024,
+    ttl: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, ResultCache]:
+    """
+    Wrap the named FUNCTION_REGISTRY entries (used by batch mode and run_jobs) in
+    ResultCaches. With cache_dir, each cache is warmed from cache_dir/<name>.cache
+    when present; call save_result_cache(cache_dir) to persist them again.
+    """
+    caches: Dict[str, ResultCache] = {}
+    for name in functions:
+        if name not in FUNCTION_REGISTRY:
+            raise ValueError(f"unknown function: {name}")
+        current = FUNCTION_REGISTRY[name]
+        fn = current.fn if isinstance(current, ResultCache) else current
+        cache = ResultCache(fn, maxsize=maxsize, ttl=ttl)
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, name + ".cache")
+            if os.path.exists(path):
+                cache.load(path)
+        FUNCTION_REGISTRY[name] = cache
+        caches[name] = cache
+    return caches
+
+
+def save_result_cache(cache_dir: str) -> None:
+    """Persist every enabled registry cache to cache_dir/<name>.cache."""
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, fn in FUNCTION_REGISTRY.items():
+        if isinstance(fn, ResultCache):
+            fn.save(os.path.join(cache_dir, name + ".cache"))
+
+
+def disable_result_cache() -> None:
+    """Restore the plain functions in FUNCTION_REGISTRY."""
+    for name, fn in FUNCTION_REGISTRY.items():
+        if isinstance(fn, ResultCache):
+            FUNCTION_REGISTRY[name] = fn.fn
+
+
+def _resolve_function(fn: Any) -> Tuple[int, str]:
+    """Map a registry name or 1-based menu number to (function_number, name)."""
+    if isinstance(fn, str) and fn in FUNCTION_REGISTRY:
+        return _FUNCTION_NAMES.index(fn) + 1, fn
+    if isinstance(fn, int) and not isinstance(fn, bool) and 1 <= fn <= len(_FUNCTION_NAMES):
+        return fn, _FUNCTION_NAMES[fn - 1]
+    raise ValueError("Invalid utility function number.")
+
+
+def run_job(job: Any) -> Dict[str, Any]:
+    """
+    Run one {"fn": name-or-number, "args": [...], "kwargs": {...}} job.
+    Never raises: failures are reported as {"fn": ..., "error": message}, like the CLI.
+    """
+    fn = job.get("fn") if isinstance(job, dict) else None
+    record: Dict[str, Any] = {"fn": fn}
+    try:
+        if not isinstance(job, dict):
+            raise TypeError("job must be a JSON object")
+        number, name = _resolve_function(fn)
+        record = {"fn": name, "function_number": number}
+        args = job.get("args", [])
+        kwargs = job.get("kwargs", {})
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            raise TypeError("args must be a list and kwargs an object")
+        record["result"] = FUNCTION_REGISTRY[name](*args, **kwargs)
+    except Exception as exc:
+        record.pop("result", None)
+        record["error"] = str(exc)
+    return record
+
+
+def iter_batch(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Run each non-blank JSONL job line; yield result records tagged with their 1-based line."""
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as exc:
+            record = {"fn": None, "error": f"invalid JSON: {exc}"}
+        else:
+            record = run_job(job)
+        record["line"] = lineno
+        yield record
+
+
+def _history_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The interactive CLI's history entry shape for a batch result record."""
+    number = record.get("function_number", record.get("fn"))
+    if "error" in record:
+        return {"function_number": number, "error": record["error"]}
+    return {"function_number": number, "output": record["result"]}
+
+
+def run_batch(
+    jobs_path: str,
+    output: Optional[str] = None,
+    history_file: Optional[str] = "utility_history.jsonl",
+) -> Dict[str, int]:
+    """
+    Stream jobs from a JSONL file to output (stdout when None) as JSON lines and log
+    history in bulk through a buffered HistoryWriter. Returns {"ok": n, "failed": n}.
+    """
+    counts = {"ok": 0, "failed": 0}
+    out = sys.stdout if output is None else open(output, "w", encoding="utf-8")
+    history = HistoryWriter(history_file, max_entries=4096) if history_file else None
+    try:
+        with open(jobs_path, "r", encoding="utf-8") as jobs:
+            for record in iter_batch(jobs):
+                counts["failed" if "error" in record else "ok"] += 1
+                out.write(json.dumps(record, ensure_ascii=False, default=repr) + "\n")
+                if history is not None:
+                    try:
+                        history.write(_history_entry(record))
+                    except (TypeError, ValueError):
+                        pass  # unserializable output: still reported on out
+    finally:
+        if history is not None:
+            history.close()
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    return counts
+
+
+class LatencyHistogram:
+    """Log2-bucketed latency histogram in microseconds; mergeable across workers."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}  # upper bound in us (power of two) -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        us = seconds * 1e6
+        bound = 1 << (math.ceil(us) - 1).bit_length() if us > 1 else 1  # next power of two
+        self.buckets[bound] = self.buckets.get(bound, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for bound, n in other.buckets.items():
+            self.buckets[bound] = self.buckets.get(bound, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p: float) -> float:
+        """Upper bucket bound (seconds) containing the p-th percentile (0-100)."""
+        if not self.count:
+            raise ValueError("histogram is empty")
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for bound in sorted(self.buckets):
+            seen += self.buckets[bound]
+            if seen >= rank:
+                return min(bound / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": self.min * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+            "p50_us": self.percentile(50) * 1e6 if self.count else 0.0,
+            "p99_us": self.percentile(99) * 1e6 if self.count else 0.0,
+            "buckets_us": dict(sorted(self.buckets.items())),
+        }
+
+
+def _run_job_chunk(start: int, chunk: List[Any]) -> List[Tuple[Dict[str, Any], float]]:
+    """Worker: run a chunk of jobs, tagging each record with its input index and timing it."""
+    out = []
+    for offset, job in enumerate(chunk):
+        t0 = time.perf_counter()
+        record = run_job(job)
+        elapsed = time.perf_counter() - t0
+        record["index"] = start + offset
+        out.append((record, elapsed))
+    return out
+
+
+def _run_unordered(executor: Any, fn: Any, arg_tuples: Iterable[Tuple[Any, ...]], window: int) -> Iterator[Any]:
+    """Like _run_bounded, but yield results as soon as any task finishes."""
+    from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+
+    pending: Set[Any] = set()
+    for args in arg_tuples:
+        pending.add(executor.submit(fn, *args))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in as_completed(pending):
+        yield future.result()
+
+
+def iter_jobs(
+    jobs: Iterable[Any],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunk_size: int = 64,
+    latency: Optional[Dict[str, LatencyHistogram]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily run jobs (see run_job) in chunks across a process pool and yield records,
+    each tagged with its 0-based input "index". ordered=False yields in completion order.
+    Per-job latencies are added to the per-function histograms in latency, if given.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or not isinstance(chunk_size, int):
+        raise TypeError("workers and chunk_size must be integers")
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be positive")
+    try:
+        iterator = iter(jobs)
+    except TypeError:
+        raise TypeError("jobs must be iterable")
+    return _iter_jobs(iterator, workers, ordered, chunk_size, latency)
+
+
+def _iter_jobs(
+    iterator: Iterator[Any],
+    workers: int,
+    ordered: bool,
+    chunk_size: int,
+    latency: Optional[Dict[str, LatencyHistogram]],
+) -> Iterator[Dict[str, Any]]:
+    tasks = ((i * chunk_size, block) for i, block in enumerate(_iter_blocks(iterator, chunk_size)))
+    if workers == 1:
+        results: Iterator[Any] = (_run_job_chunk(*args) for args in tasks)
+        yield from _record_latencies(results, latency)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        run = _run_bounded if ordered else _run_unordered
+        yield from _record_latencies(run(executor, _run_job_chunk, tasks, 2 * workers), latency)
+
+
+def _record_latencies(
+    chunks: Iterable[List[Tuple[Dict[str, Any], float]]],
+    latency: Optional[Dict[str, LatencyHistogram]],
+) -> Iterator[Dict[str, Any]]:
+    for chunk in chunks:
+        for record, elapsed in chunk:
+            if latency is not None:
+                key = str(record.get("fn"))
+                if key not in latency:
+                    latency[key] = LatencyHistogram()
+                latency[key].add(elapsed)
+            yield record
+
+
+def run_jobs(
+    jobs: Iterable[Any],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunk_size: int = 64,
+) -> Tuple[List[Dict[str, Any]], Dict[str, LatencyHistogram]]:
+    """
+    Run jobs across a process pool; return (records, per-function LatencyHistogram).
+    Failures never raise: they come back as {"fn": ..., "error": ...} records like the CLI's.
+    """
+    latency: Dict[str, LatencyHistogram] = {}
+    records = list(iter_jobs(jobs, workers=workers, ordered=ordered, chunk_size=chunk_size, latency=latency))
+    return records, latency
@@ -0,0 +1,206 @@
+"""
+Utility Toolkit - interactive menu and command-line entry point (see __main__.py).
+"""
+
+import argparse
+import ast
+import sys
+from typing import List, Optional
+
+from .batch import run_batch
+from .collection_utils import (
+    calculate_stats,
+    find_maximum,
+    flatten_list,
+    get_unique_elements,
+    merge_dicts,
+)
+from .history import save_history
+from .math_utils import apply_discount, factorial, fibonacci, gcd, is_prime, lcm
+from .text_utils import (
+    _numbers_from_tokens,
+    _scan_numbers,
+    clean_text,
+    count_vowels,
+    is_palindrome,
+    parse_numbers,
+    reverse_string,
+    sentence_to_words,
+)
+
+
+# -----------------------------
+# CLI helpers (safe parsing)
+# -----------------------------
+def _safe_literal_eval(user_input: str):
+    """
+    Try to parse Python literal (list/dict/number). Fall back to token parsing with numeric casts.
+    Returns: parsed python object (int/float/str/list/etc.)
+    """
+    # Flat lists of numbers (pasted columns) skip the AST: scanned once, converted in bulk.
+    # Single numbers and tuples keep going through literal_eval.
+    head = user_input.lstrip()[:1]
+    if head != "(":
+        scanned = _scan_numbers(user_input, literal=True)
+        if scanned is not None and (head == "[" or len(scanned[0]) > 1):
+            return _numbers_from_tokens(*scanned)
+    try:
+        return ast.literal_eval(user_input)
+    except Exception:
+        tokens = user_input.strip().split()
+        if not tokens:
+            return []
+        if len(tokens) == 1:
+            tok = tokens[0]
+            for cast in (int, float):
+                try:
+                    return cast(tok)
+                except (ValueError, TypeError):
+                    continue
+            return tok
+        out = []
+        for t in tokens:
+            for cast in (int, float):
+                try:
+                    out.append(cast(t))
+                    break
+                except (ValueError, TypeError):
+                    continue
+            else:
+                out.append(t)
+        return out
+
+
+# Minimal CLI example (safe exit and logging)
+def _run_interactive() -> int:
+    print("Utility toolkit loaded.")
+    print("Available functions:")
+    print("1: check prime number")
+    print("2: factorial ")
+    print("3: fibonacci sequence")
+    print("4: count vowels in string")
+    print("5: reverse string")
+    print("6: get unique elements from list")
+    print("7: merge two dictionaries")
+    print("8: find maximum in list")
+    print("9: flatten nested list")
+    print("10: calculate statistics of numbers")
+    print("11: check if string is palindrome")
+    print("12: compute GCD of two numbers")
+    print("13: compute LCM of two numbers")
+    print("14: apply discount to price")
+    print("15: clean text (lowercase, remove punctuation)")
+    print("16: split sentence into words")
+
+    try:
+        n = int(input("enter your utility function number (1-16): ").strip())
+    except ValueError:
+        print("Invalid input. Please enter an integer.")
+        return 1
+
+    try:
+        if n == 1:
+            val = int(input("enter number: ").strip())
+            out = is_prime(val)
+        elif n == 2:
+            val = int(input("enter number: ").strip())
+            out = factorial(val)
+        elif n == 3:
+            val = int(input("enter the number : ").strip())
+            out = fibonacci(val)
+        elif n == 4:
+            s = input("enter string: ")
+            out = count_vowels(s)
+        elif n == 5:
+            s = input("enter string: ")
+            out = reverse_string(s)
+        elif n == 6:
+            raw = input("enter list elements (python literal or space-separated): ")
+            parsed = _safe_literal_eval(raw)
+            out = get_unique_elements(parsed)
+        elif n == 7:
+            raw1 = input("enter first dict (python literal): ")
+            raw2 = input("enter second dict (python literal): ")
+            d1 = _safe_literal_eval(raw1)
+            d2 = _safe_literal_eval(raw2)
+            if not isinstance(d1, dict) or not isinstance(d2, dict):
+                raise TypeError("Both inputs must be dicts (e.g. {'a':1}).")
+            out = merge_dicts(d1, d2)
+        elif n == 8:
+            raw = input("enter list elements (python literal or space-separated): ")
+            parsed = _safe_literal_eval(raw)
+            if not isinstance(parsed, list):
+                parsed = [parsed]
+            nums = [int(x) for x in parsed]
+            out = find_maximum(nums)
+        elif n == 9:
+            raw = input("enter nested list (python literal): ")
+            parsed = _safe_literal_eval(raw)
+            out = flatten_list(parsed)
+        elif n == 10:
+            raw = input("enter list elements (python literal or space-separated): ")
+            try:
+                numbers = parse_numbers(raw, typecode="d")
+            except ValueError:
+                parsed = _safe_literal_eval(raw)
+                if not isinstance(parsed, list):
+                    parsed = [parsed]
+                numbers = [float(x) for x in parsed]
+            out = calculate_stats(numbers)
+        elif n == 11:
+            s = input("enter string: ")
+            out = is_palindrome(s)
+        elif n == 12:
+            a = int(input("enter first number: ").strip())
+            b = int(input("enter second number: ").strip())
+            out = gcd(a, b)
+        elif n == 13:
+            a = int(input("enter first number: ").strip())
+            b = int(input("enter second number: ").strip())
+            out = lcm(a, b)
+        elif n == 14:
+            price = float(input("enter price: ").strip())
+            discount = float(input("enter discount percentage: ").strip())
+            out = apply_discount(price, discount)
+        elif n == 15:
+            text = input("enter text: ")
+            out = clean_text(text)
+        elif n == 16:
+            sentence = input("enter sentence: ")
+            out = sentence_to_words(sentence)
+        else:
+            raise ValueError("Invalid utility function number.")
+    except Exception as exc:
+        print("Error:", exc)
+        # Log the failure and exit gracefully
+        try:
+            save_history({"function_number": n, "error": str(exc)})
+        except Exception:
+            pass
+        return 1
+
+    print("Result:", out)
+    # Save a compact history entry with timestamp
+    save_history({"function_number": n, "output": out})
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interactive menu by default; --batch JOBS.jsonl runs a job file non-interactively."""
+    parser = argparse.ArgumentParser(description="Utility toolkit CLI.")
+    parser.add_argument("--batch", metavar="JOBS", help='JSONL file of {"fn": ..., "args": [...]} jobs')
+    parser.add_argument("--output", metavar="FILE", help="write batch results here instead of stdout")
+    parser.add_argument("--history", metavar="FILE", default="utility_history.jsonl",
+                        help="history log for batch mode (default: %(default)s)")
+    parser.add_argument("--no-history", action="store_true", help="do not log batch results")
+    args = parser.parse_args(argv)
+    if args.batch is None:
+        return _run_interactive()
+    try:
+        counts = run_batch(args.batch, args.output, None if args.no_history else args.history)
+    except OSError as exc:
+        print("Error:", exc, file=sys.stderr)
+        return 1
+    print(f"Batch done: {counts['ok']} ok, {counts['failed']} failed.", file=sys.stderr)
+    return 0 if counts["failed"] == 0 else 2
+
@@ -0,0 +1,635 @@
+"""
+Utility Toolkit - list, dict and statistics helpers.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+from array import array
+from collections import ChainMap, deque
+from itertools import islice, repeat
+from operator import itemgetter, sub
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+    Number = Union[int, float]
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x: int) -> int:
+    """splitmix64 finalizer: spread the bits of a Python hash over 64 bits."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class BloomFilter:
+    """
+    Fixed-memory set membership with false positives but no false negatives.
+    Sized for capacity items at the given false-positive rate; uses double hashing
+    over hash(item), so it is only meaningful within one process.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if not isinstance(capacity, int) or not isinstance(error_rate, (int, float)):
+            raise TypeError("capacity must be an integer and error_rate a number")
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: Any) -> Iterator[int]:
+        h = _mix64(hash(item) & _MASK64)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, item: Any) -> bool:
+        """Insert item; return True if it was (probably) already present."""
+        bits = self._bits
+        present = True
+        for pos in self._positions(item):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, item: Any) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+def iter_unique(
+    iterable: Iterable[Any],
+    key: Optional[Callable[[Any], Any]] = None,
+    approximate: bool = False,
+    capacity: int = 1_000_000,
+    error_rate: float = 0.01,
+) -> Iterator[Any]:
+    """
+    Lazily yield first-seen items, deduplicated by key(item) when key is given.
+    approximate=True replaces the seen-set with a fixed-size BloomFilter: memory stays
+    constant, duplicates are never yielded, but about error_rate of new items are dropped.
+    """
+    try:
+        iterator = iter(iterable)
+    except TypeError:
+        raise TypeError("iterable must be iterable")
+    if key is not None and not callable(key):
+        raise TypeError("key must be callable")
+    if approximate:
+        bloom = BloomFilter(capacity, error_rate)
+        return _iter_unique_approx(iterator, key, bloom)
+    return _iter_unique_exact(iterator, key)
+
+
+def _iter_unique_exact(iterator: Iterator[Any], key: Optional[Callable[[Any], Any]]) -> Iterator[Any]:
+    seen: set = set()
+    add = seen.add
+    if key is None:
+        for item in iterator:
+            if item not in seen:
+                add(item)
+                yield item
+    else:
+        for item in iterator:
+            k = key(item)
+            if k not in seen:
+                add(k)
+                yield item
+
+
+def _iter_unique_approx(
+    iterator: Iterator[Any], key: Optional[Callable[[Any], Any]], bloom: BloomFilter
+) -> Iterator[Any]:
+    add = bloom.add
+    for item in iterator:
+        if not add(item if key is None else key(item)):
+            yield item
+
+
+def get_unique_elements(lst: Iterable[Any], key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """Return list of unique elements preserving first-seen order (by key(item) if given)."""
+    try:
+        iterator = iter(lst)
+    except TypeError:
+        raise TypeError("lst must be iterable")
+    if key is None:
+        # dict keeps insertion order and the first-seen key object, like the set scan did.
+        return list(dict.fromkeys(iterator))
+    return list(iter_unique(iterator, key=key))
+
+
+def merge_dicts(dict1: Dict[Any, Any], dict2: Dict[Any, Any]) -> Dict[Any, Any]:
+    """Return a new dict merging dict1 and dict2; dict2 overrides. Validate types."""
+    if not isinstance(dict1, dict) or not isinstance(dict2, dict):
+        raise TypeError("both arguments must be dicts")
+    merged = dict1.copy()
+    merged.update(dict2)
+    return merged
+
+
+_NO_ITEM = object()
+
+
+def merge_many(*dicts: Dict[Any, Any], lazy: bool = True) -> Union["ChainMap[Any, Any]", Dict[Any, Any]]:
+    """
+    Merge any number of dicts, later ones overriding earlier ones. By default returns a
+    ChainMap view that copies nothing: lookups search the layers, and writes go to a
+    private front layer, never to the inputs. lazy=False (or dict(view)) materializes it.
+    """
+    for d in dicts:
+        if not isinstance(d, dict):
+            raise TypeError("all arguments must be dicts")
+    if lazy:
+        return ChainMap({}, *reversed(dicts))
+    merged: Dict[Any, Any] = {}
+    for d in dicts:
+        merged.update(d)
+    return merged
+
+
+def deep_merge(base: Dict[Any, Any], *overrides: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    Recursively merge overrides into base (later wins; nested dicts are merged, other
+    values replaced) without modifying any input. Only dicts on changed paths are
+    copied; untouched subtrees are shared with the inputs, not deep-copied.
+    """
+    if not isinstance(base, dict) or not all(isinstance(d, dict) for d in overrides):
+        raise TypeError("all arguments must be dicts")
+    merged = base
+    for override in overrides:
+        merged = _deep_merge_pair(merged, override)
+    return merged if merged is not base else base.copy()
+
+
+def _deep_merge_pair(base: Dict[Any, Any], override: Dict[Any, Any]) -> Dict[Any, Any]:
+    """Return base with override merged in, or base itself when nothing changes."""
+    merged = base
+    for key, value in override.items():
+        current = base.get(key, _NO_ITEM)
+        if isinstance(value, dict) and isinstance(current, dict):
+            value = _deep_merge_pair(current, value)
+        if value is current:
+            continue
+        if merged is base:
+            merged = base.copy()
+        merged[key] = value
+    return merged
+
+
+def find_maximum(lst: Iterable[Number]) -> Number:
+    """Return maximum value from iterable. Raise ValueError for empty iterable."""
+    try:
+        iterator = iter(lst)
+    except TypeError:
+        raise TypeError("lst must be iterable")
+    try:
+        first = next(iterator)
+    except StopIteration:
+        raise ValueError("lst is empty")
+    current_max = first
+    for item in iterator:
+        if item > current_max:
+            current_max = item
+    return current_max
+
+
+def top_k(iterable: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Return the k largest items, largest first, keeping only k items in a heap
+    (O(n log k) instead of sorting everything). Ties keep their input order.
+    """
+    if not isinstance(k, int):
+        raise TypeError("k must be an integer")
+    if k < 0:
+        raise ValueError("k must be non-negative")
+    try:
+        iterator = iter(iterable)
+    except TypeError:
+        raise TypeError("iterable must be iterable")
+    return heapq.nlargest(k, iterator, key=key)
+
+
+def _arg_extreme(
+    pick: Callable[..., Any], iterable: Iterable[Any], key: Optional[Callable[[Any], Any]]
+) -> Tuple[int, Any]:
+    """Run min/max over (index, item) pairs, comparing items (or key(item)) only."""
+    try:
+        iterator = iter(iterable)
+    except TypeError:
+        raise TypeError("iterable must be iterable")
+    if key is None:
+        by_value = itemgetter(1)
+    else:
+        def by_value(pair: Tuple[int, Any]) -> Any:
+            return key(pair[1])
+    found = pick(enumerate(iterator), key=by_value, default=None)
+    if found is None:
+        raise ValueError("iterable is empty")
+    return found
+
+
+def argmax(iterable: Iterable[Any], key: Optional[Callable[[Any], Any]] = None) -> Tuple[int, Any]:
+    """Return (index, value) of the first largest item in one pass. Raise ValueError if empty."""
+    return _arg_extreme(max, iterable, key)
+
+
+def argmin(iterable: Iterable[Any], key: Optional[Callable[[Any], Any]] = None) -> Tuple[int, Any]:
+    """Return (index, value) of the first smallest item in one pass. Raise ValueError if empty."""
+    return _arg_extreme(min, iterable, key)
+
+
+def min_max(iterable: Iterable[Any], key: Optional[Callable[[Any], Any]] = None) -> Tuple[Any, Any]:
+    """
+    Return (smallest, largest) in one pass, comparing items in pairs: about 1.5
+    comparisons and one key call per element. Lists, tuples and arrays of
+    plain numbers use the C min()/max() instead, which is faster despite two passes.
+    """
+    if key is None and (
+        isinstance(iterable, array) and iterable.typecode in _NUMERIC_TYPECODES
+        or isinstance(iterable, (list, tuple)) and set(map(type, iterable)) <= _NUMERIC_TYPES
+    ):
+        if not iterable:
+            raise ValueError("iterable is empty")
+        return min(iterable), max(iterable)
+    try:
+        iterator = iter(iterable)
+    except TypeError:
+        raise TypeError("iterable must be iterable")
+    try:
+        first = next(iterator)
+    except StopIteration:
+        raise ValueError("iterable is empty")
+    if key is None:
+        low = high = first
+        for a in iterator:
+            b = next(iterator, a)  # odd tail: pair the last item with itself
+            if b < a:
+                a, b = b, a
+            if a < low:
+                low = a
+            if b > high:
+                high = b if a < b else a  # equal pair: keep the earlier item, like max()
+        return low, high
+    low = high = first
+    low_key = high_key = key(first)
+    for a in iterator:
+        b = next(iterator, _NO_ITEM)
+        a_key = key(a)
+        if b is _NO_ITEM:
+            b, b_key = a, a_key
+        else:
+            b_key = key(b)
+            if b_key < a_key:
+                a, b, a_key, b_key = b, a, b_key, a_key
+        if a_key < low_key:
+            low, low_key = a, a_key
+        if b_key > high_key:
+            high, high_key = (b, b_key) if a_key < b_key else (a, a_key)
+    return low, high
+
+
+def _check_max_depth(max_depth: Optional[int]) -> None:
+    if max_depth is not None:
+        if not isinstance(max_depth, int):
+            raise TypeError("max_depth must be an integer or None")
+        if max_depth < 0:
+            raise ValueError("max_depth must be non-negative")
+
+
+def iter_flatten(nested: Iterable[Any], max_depth: Optional[int] = None) -> Iterator[Any]:
+    """
+    Lazily flatten nested lists/tuples with an explicit stack (no recursion limit).
+    Strings, arrays and memoryviews are leaves. max_depth limits how many levels are opened.
+    """
+    try:
+        iterator = iter(nested)
+    except TypeError:
+        raise TypeError("nested must be iterable")
+    _check_max_depth(max_depth)
+    return _iter_flatten(iterator, max_depth)
+
+
+def _iter_flatten(iterator: Iterator[Any], max_depth: Optional[int]) -> Iterator[Any]:
+    stack = [iterator]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, (list, tuple)) and (max_depth is None or len(stack) <= max_depth):
+                stack.append(iter(item))
+                break
+            yield item
+        else:
+            stack.pop()
+
+
+def _has_nested(seq: Any) -> bool:
+    """True if seq holds any list/tuple; checks distinct item types, not every item."""
+    return any(issubclass(t, (list, tuple)) for t in set(map(type, seq)))
+
+
+def flatten_list(nested_lst: Iterable[Any], max_depth: Optional[int] = None) -> List[Any]:
+    """Flatten nested lists/tuples into a flat list. Strings are not expanded."""
+    try:
+        iterator = iter(nested_lst)
+    except TypeError:
+        raise TypeError("nested_lst must be iterable")
+    _check_max_depth(max_depth)
+    top = nested_lst if isinstance(nested_lst, (list, tuple)) else list(iterator)
+    out: List[Any] = []
+    extend = out.extend
+    # Explicit stack of (sequence, resume index, depth); runs of scalars are
+    # copied with a single extend() instead of one append per item.
+    stack = [(top, 0, 0)]
+    while stack:
+        seq, start, depth = stack.pop()
+        if start == 0 and (depth == max_depth or not _has_nested(seq)):
+            extend(seq)
+            continue
+        for i in range(start, len(seq)):
+            item = seq[i]
+            if isinstance(item, (list, tuple)):
+                extend(seq[start:i])
+                stack.append((seq, i + 1, depth))
+                stack.append((item, 0, depth + 1))
+                break
+        else:
+            extend(seq[start:])
+    return out
+
+
+_STATS_BLOCK = 1 << 16
+_NUMERIC_TYPECODES = frozenset("bBhHiIlLqQfd")
+_NUMERIC_TYPES = frozenset((int, float, bool))
+
+
+class StatsAccumulator:
+    """
+    Single-pass, mergeable running statistics: count, sum, min, max, mean, variance.
+    Feed values with update()/update_many() and combine shard partials with merge().
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total: Number = 0
+        self.min: Optional[Number] = None
+        self.max: Optional[Number] = None
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+
+    def update(self, x: Number) -> None:
+        """Add one value (Welford's update)."""
+        if not isinstance(x, (int, float)):
+            raise TypeError("all items must be int or float")
+        self.count += 1
+        self.total += x
+        if self.count == 1:
+            self.min = self.max = x
+        elif x < self.min:
+            self.min = x
+        elif x > self.max:
+            self.max = x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+
+    def update_many(self, values: Iterable[Number]) -> None:
+        """Add every value, in fixed-size blocks so iterators never materialize fully."""
+        for block in _iter_blocks(values, _STATS_BLOCK):
+            self.merge(_block_stats(block))
+
+    def merge(self, other: "StatsAccumulator") -> "StatsAccumulator":
+        """Fold another accumulator into this one (Chan et al. parallel update)."""
+        if not isinstance(other, StatsAccumulator):
+            raise TypeError("other must be a StatsAccumulator")
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.total = other.count, other.total
+            self.min, self.max = other.min, other.max
+            self._mean, self._m2 = other._mean, other._m2
+            return self
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        if other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    @property
+    def mean(self) -> float:
+        if not self.count:
+            raise ValueError("numbers is empty")
+        return self.total / self.count
+
+    @property
+    def variance(self) -> float:
+        """Population variance (ddof=0)."""
+        if not self.count:
+            raise ValueError("numbers is empty")
+        return self._m2 / self.count
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def as_dict(self) -> Dict[str, Number]:
+        """Return the calculate_stats dict: mean, min, max, sum, length."""
+        return {
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "sum": self.total,
+            "length": self.count,
+        }
+
+    @classmethod
+    def from_buffer(cls, buf: Any) -> "StatsAccumulator":
+        """Build from an array.array, 1-D numeric memoryview or NumPy array without per-item checks."""
+        if type(buf).__module__ == "numpy" and hasattr(buf, "dtype"):
+            # Use ndarray methods directly so NumPy stays an optional dependency.
+            if buf.dtype.kind not in "biuf":
+                raise TypeError("all items must be int or float")
+            flat = buf.ravel()
+            acc = cls()
+            if flat.size:
+                acc.count = int(flat.size)
+                acc.total = flat.sum().item()
+                acc.min = flat.min().item()
+                acc.max = flat.max().item()
+                acc._mean = acc.total / acc.count
+                acc._m2 = float(flat.var()) * acc.count
+            return acc
+        _check_numeric_buffer(buf)
+        return _block_stats(buf, checked=True)
+
+
+def _check_numeric_buffer(buf: Any) -> None:
+    """Raise TypeError unless buf is an array.array or 1-D memoryview of numbers."""
+    if isinstance(buf, memoryview):
+        if buf.ndim != 1 or buf.format.lstrip("@=<>!") not in _NUMERIC_TYPECODES:
+            raise TypeError("all items must be int or float")
+    elif isinstance(buf, array):
+        if buf.typecode not in _NUMERIC_TYPECODES:
+            raise TypeError("all items must be int or float")
+    else:
+        raise TypeError("buf must be an array, memoryview or NumPy array")
+
+
+def _iter_blocks(values: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items from values."""
+    try:
+        iterator = iter(values)
+    except TypeError:
+        raise TypeError("numbers must be iterable")
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def _block_stats(block: Any, checked: bool = False, spread: bool = True) -> StatsAccumulator:
+    """
+    Accumulator for an in-memory block using C-level builtins instead of a Python loop.
+    spread=False skips the variance pass; the result then has no meaningful variance.
+    """
+    acc = StatsAccumulator()
+    if not len(block):
+        return acc
+    if not checked and not set(map(type, block)) <= _NUMERIC_TYPES:
+        # Slow path only for subclasses (e.g. numpy scalars) or bad items.
+        for x in block:
+            if not isinstance(x, (int, float)):
+                raise TypeError("all items must be int or float")
+    acc.count = len(block)
+    acc.total = sum(block)
+    acc.min = min(block)
+    acc.max = max(block)
+    acc._mean = acc.total / acc.count
+    if spread:
+        acc._m2 = sum(map(pow, map(sub, block, repeat(acc._mean)), repeat(2)))
+    else:
+        acc._m2 = math.nan
+    return acc
+
+
+def calculate_stats(lst: Iterable[Number]) -> Dict[str, Number]:
+    """Return dict with mean, min, max, sum, length. Validate numeric items."""
+    if isinstance(lst, (array, memoryview)):
+        _check_numeric_buffer(lst)
+        acc = _block_stats(lst, checked=True, spread=False)
+    elif type(lst).__module__ == "numpy":
+        acc = StatsAccumulator.from_buffer(lst)
+    elif isinstance(lst, (list, tuple)):
+        acc = _block_stats(lst, spread=False)
+    else:
+        acc = StatsAccumulator()
+        for block in _iter_blocks(lst, _STATS_BLOCK):
+            acc.merge(_block_stats(block, spread=False))
+    if not acc.count:
+        raise ValueError("numbers is empty")
+    return acc.as_dict()
+
+
+def _chunk_stats(chunk: Any) -> StatsAccumulator:
+    """Worker: full accumulator (with variance) for one in-memory chunk."""
+    if isinstance(chunk, array):
+        return _block_stats(chunk, checked=True)
+    return _block_stats(chunk)
+
+
+def _file_chunk_stats(path: str, typecode: str, start: int, stop: int) -> StatsAccumulator:
+    """Worker: accumulator for items [start, stop) of a memory-mapped binary file."""
+    import mmap
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as raw, raw.cast(typecode) as items, items[start:stop] as view:
+            return _block_stats(view, checked=True)
+
+
+def _run_bounded(executor: Any, fn: Any, arg_tuples: Iterable[Tuple[Any, ...]], window: int) -> Iterator[Any]:
+    """Submit fn(*args) with at most window tasks in flight; yield results in input order."""
+    pending: "deque[Any]" = deque()
+    for args in arg_tuples:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def calculate_stats_parallel(
+    source: Any,
+    workers: Optional[int] = None,
+    chunk_size: int = 1 << 20,
+    typecode: str = "d",
+) -> Dict[str, Number]:
+    """
+    calculate_stats across a process pool; returns its keys plus variance and stddev.
+    source is a list/tuple/array/iterable of numbers, or the path of a raw binary file
+    of typecode items (native byte order) which each worker memory-maps on its own.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or not isinstance(chunk_size, int):
+        raise TypeError("workers and chunk_size must be integers")
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be positive")
+
+    if isinstance(source, (str, os.PathLike)):
+        if typecode not in _NUMERIC_TYPECODES:
+            raise ValueError("typecode must be a numeric array typecode")
+        path = os.fspath(source)
+        itemsize = array(typecode).itemsize
+        size = os.path.getsize(path)
+        if size % itemsize:
+            raise ValueError("file size is not a multiple of the item size")
+        count = size // itemsize
+        fn = _file_chunk_stats
+        tasks = ((path, typecode, lo, min(lo + chunk_size, count)) for lo in range(0, count, chunk_size))
+    elif isinstance(source, (list, tuple, array)):
+        if isinstance(source, array):
+            _check_numeric_buffer(source)
+        fn = _chunk_stats
+        tasks = ((source[lo:lo + chunk_size],) for lo in range(0, len(source), chunk_size))
+    else:
+        fn = _chunk_stats
+        tasks = ((block,) for block in _iter_blocks(source, chunk_size))
+
+    acc = StatsAccumulator()
+    if workers == 1:
+        for args in tasks:
+            acc.merge(fn(*args))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in _run_bounded(executor, fn, tasks, 2 * workers):
+                acc.merge(partial)
+    if not acc.count:
+        raise ValueError("numbers is empty")
+    result = acc.as_dict()
+    result["variance"] = acc.variance
+    result["stddev"] = acc.stddev
+    return result
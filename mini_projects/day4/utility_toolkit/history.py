@@ -0,0 +1,620 @@
+"""
+Utility Toolkit - JSONL history logging: buffered/rotating writer and indexed reader.
+"""
+
+import atexit
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# -----------------------------
+# History logging utility
+# -----------------------------
+class HistoryWriter:
+    """
+    Buffered JSONL history writer. Entries are serialized to UTF-8 on write() and flushed
+    to filename once max_entries or max_bytes (encoded) are buffered, or flush_interval seconds
+    have passed (checked on write, or by a background thread when background=True).
+    The file stays open between flushes; write errors are swallowed like save_history.
+    Open writers are flushed at interpreter exit.
+
+    Rotation: once the file would exceed about rotate_bytes bytes on disk, or rotate_interval seconds
+    after its first entry was written (by any process), it is renamed to filename.1 (older
+    segments shift to .2, .3, ...; only backup_count are kept) and gzip-compressed to
+    filename.1.gz in a background thread. As with logging's RotatingFileHandler,
+    backup_count=0 disables rotation. iter_history() streams across the segments in order.
+    """
+
+    def __init__(
+        self,
+        filename: str = "utility_history.jsonl",
+        max_entries: int = 256,
+        max_bytes: int = 1 << 20,
+        flush_interval: float = 1.0,
+        background: bool = False,
+        rotate_bytes: Optional[int] = None,
+        rotate_interval: Optional[float] = None,
+        backup_count: int = 5,
+        compress: bool = True,
+    ) -> None:
+        if not isinstance(backup_count, int) or backup_count < 0:
+            raise ValueError("backup_count must be a non-negative integer")
+        self.filename = filename
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self._segment_size = 0
+        self._segment_started = 0.0
+        self._compressor: Optional[threading.Thread] = None
+        self._buffer: List[bytes] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._file: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.closed = False
+        _OPEN_WRITERS.add(self)
+        if background:
+            self.start_background()
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Buffer one entry (a UTC "ts" is injected if missing)."""
+        if not isinstance(entry, dict):
+            raise TypeError("entry must be a dict")
+        entry.setdefault("ts", datetime.utcnow().isoformat() + "Z")
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self.closed:
+                raise ValueError("write to closed HistoryWriter")
+            self._buffer.append(line)
+            self._buffered_bytes += len(line)
+            if (
+                len(self._buffer) >= self.max_entries
+                or self._buffered_bytes >= self.max_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        try:
+            if self._file is None:
+                self._open_locked()
+            if self._should_rotate(len(data)):
+                self._rotate_locked()
+                if self._file is None:
+                    self._open_locked()
+            self._file.write(data)
+            self._file.flush()
+            self._segment_size += len(data)
+        except OSError:
+            # Non-fatal: do not crash the main program if logging fails
+            self._close_file()
+
+    def _open_locked(self) -> None:
+        self._file = open(self.filename, "ab")
+        self._segment_size = self._file.tell()
+        self._segment_started = self._first_entry_time() if self._segment_size else time.time()
+
+    def _first_entry_time(self) -> float:
+        """Epoch "ts" of the segment's first entry, else its mtime: how old an existing file is."""
+        try:
+            with open(self.filename, "rb") as f:
+                first = f.readline(1 << 16)
+            started = _ts_to_epoch(json.loads(first).get("ts"))
+        except (OSError, ValueError, AttributeError):
+            started = math.nan
+        if math.isnan(started):
+            try:
+                started = os.stat(self.filename).st_mtime
+            except OSError:
+                started = time.time()
+        return started
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if not self.backup_count:
+            return False
+        if self.rotate_bytes is not None and self._segment_size and self._segment_size + incoming > self.rotate_bytes:
+            return True
+        return self.rotate_interval is not None and time.time() - self._segment_started >= self.rotate_interval
+
+    def _rotate_locked(self) -> None:
+        """Shift filename.N[.gz] to N+1, drop segments beyond backup_count, start a new file."""
+        self._close_file()
+        self._wait_compressor()
+        base = self.filename
+        try:
+            for n in sorted(_segment_numbers(base), reverse=True):
+                for suffix in (".gz", ""):
+                    src = f"{base}.{n}{suffix}"
+                    if not os.path.exists(src):
+                        continue
+                    if n >= self.backup_count:
+                        os.remove(src)  # retention: keep at most backup_count segments
+                    else:
+                        os.replace(src, f"{base}.{n + 1}{suffix}")
+            os.replace(base, base + ".1")
+        except OSError:
+            return  # keep appending to the current file rather than losing entries
+        try:
+            os.remove(base + ".idx")  # HistoryReader index of the old segment
+        except OSError:
+            pass
+        if self.compress:
+            self._compressor = threading.Thread(
+                target=_gzip_segment, args=(base + ".1",), name="HistoryWriter-gzip", daemon=True
+            )
+            self._compressor.start()
+
+    def _wait_compressor(self) -> None:
+        if self._compressor is not None and self._compressor is not threading.current_thread():
+            self._compressor.join()
+            self._compressor = None
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def start_background(self) -> None:
+        """Flush every flush_interval seconds from a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="HistoryWriter-flush", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Flush remaining entries, stop the background thread and close the file."""
+        if self.closed:
+            return
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        with self._lock:
+            self._flush_locked()
+            self._close_file()
+            self._wait_compressor()
+            self.closed = True
+        _OPEN_WRITERS.discard(self)
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+# Strong references: a writer stays alive until closed so atexit can flush it.
+_OPEN_WRITERS: "set[HistoryWriter]" = set()
+# save_history writers by absolute filename, least recently used first; each holds an open file.
+_SHARED_WRITERS: "OrderedDict[str, HistoryWriter]" = OrderedDict()
+_MAX_SHARED_WRITERS = 8
+_SHARED_WRITERS_LOCK = threading.Lock()
+
+
+def _gzip_segment(path: str) -> None:
+    """Compress a rotated segment to path + ".gz" and remove the original."""
+    import gzip
+    import shutil
+
+    tmp = path + ".gz.tmp"
+    try:
+        with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, path + ".gz")
+        os.remove(path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _segment_numbers(filename: str) -> Set[int]:
+    """Numbers N of existing filename.N / filename.N.gz rotated segments."""
+    directory = os.path.dirname(filename) or "."
+    prefix = os.path.basename(filename) + "."
+    numbers = set()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    for name in names:
+        if name.startswith(prefix):
+            number = name[len(prefix):]
+            if number.endswith(".gz"):
+                number = number[:-3]
+            if number.isdigit():
+                numbers.add(int(number))
+    return numbers
+
+
+def _history_segments(filename: str) -> List[str]:
+    """Existing segments of a rotated log, oldest first, ending with filename itself."""
+    segments = []
+    for n in sorted(_segment_numbers(filename), reverse=True):
+        path = f"{filename}.{n}"
+        # Prefer the compressed copy; both exist briefly while compression finishes.
+        segments.append(path + ".gz" if os.path.exists(path + ".gz") else path)
+    segments.append(filename)
+    return segments
+
+
+def iter_history(filename: str = "utility_history.jsonl", include_rotated: bool = True) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Stream decoded entries oldest to newest across rotated (.N.gz / .N) segments and the
+    live file. Lines that are not JSON objects yield None.
+    """
+    segments = _history_segments(filename) if include_rotated else [filename]
+    return _iter_history(segments)
+
+
+def _iter_history(segments: List[str]) -> Iterator[Optional[Dict[str, Any]]]:
+    import gzip
+
+    for path in segments:
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            f = opener(path, "rt", encoding="utf-8")
+        except OSError:
+            continue  # removed by retention or rotation meanwhile
+        with f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # last line still being written
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                yield entry if isinstance(entry, dict) else None
+
+
+def _close_open_writers() -> None:
+    close_history_writers()
+    for writer in list(_OPEN_WRITERS):
+        writer.close()
+
+
+def _release_inherited_file(writer: HistoryWriter) -> None:
+    """Close a writer's file in a forked child without writing the parent's pending data."""
+    f, writer._file = writer._file, None
+    if f is None:
+        return
+    try:
+        # Point the inherited descriptor at /dev/null first: whatever the parent left in
+        # the file object's buffer is flushed there instead of into its log.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            os.dup2(devnull, f.fileno())
+        finally:
+            os.close(devnull)
+        f.close()
+    except (OSError, ValueError):
+        pass
+
+
+def _forget_shared_writers() -> None:
+    # A forked child must not reuse the parent's locks, buffered lines or open files.
+    global _SHARED_WRITERS_LOCK
+    _SHARED_WRITERS_LOCK = threading.Lock()
+    for writer in _OPEN_WRITERS:
+        writer._lock = threading.Lock()
+        writer._buffer.clear()
+        writer._buffered_bytes = 0
+        _release_inherited_file(writer)
+    _SHARED_WRITERS.clear()
+    _OPEN_WRITERS.clear()
+
+
+atexit.register(_close_open_writers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_shared_writers)
+
+
+def get_history_writer(filename: str = "utility_history.jsonl", **options: Any) -> HistoryWriter:
+    """
+    Return the process-wide writer used by save_history for filename.
+    It is write-through (max_entries=1) by default so lines are visible immediately;
+    loop-heavy callers can raise max_entries or call start_background() on it.
+    Passing HistoryWriter options (e.g. rotate_bytes=10 << 20, backup_count=7) replaces
+    the shared writer, so every later save_history(filename=...) call uses them.
+    Only the _MAX_SHARED_WRITERS most recently used files are kept open; older writers
+    are closed (their options are forgotten) and reopened on demand.
+    """
+    key = os.path.abspath(filename)
+    evicted = []
+    with _SHARED_WRITERS_LOCK:
+        writer = _SHARED_WRITERS.get(key)
+        if writer is not None and options:
+            writer.close()
+        if writer is None or writer.closed:
+            writer = HistoryWriter(filename, **{"max_entries": 1, **options})
+            _SHARED_WRITERS[key] = writer
+        _SHARED_WRITERS.move_to_end(key)
+        while len(_SHARED_WRITERS) > _MAX_SHARED_WRITERS:
+            evicted.append(_SHARED_WRITERS.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return writer
+
+
+def close_history_writers() -> None:
+    """Flush and close every shared save_history writer (also run at interpreter exit)."""
+    with _SHARED_WRITERS_LOCK:
+        writers = list(_SHARED_WRITERS.values())
+        _SHARED_WRITERS.clear()
+    for writer in writers:
+        writer.close()
+
+
+def save_history(entry: Dict[str, Any], filename: str = "utility_history.jsonl") -> None:
+    """
+    Append a single JSON object (entry) as a new line to filename.
+    Entry should be a dict describing: function, input, output, timestamp(optional), notes(optional).
+    This function injects a UTC timestamp and silently ignores file write errors.
+    Writes go through the shared HistoryWriter for filename, which keeps the file open.
+    """
+    if not isinstance(entry, dict):
+        raise TypeError("entry must be a dict")
+    writer = get_history_writer(filename)
+    try:
+        writer.write(entry)
+    except ValueError:
+        if not writer.closed:
+            raise
+        get_history_writer(filename).write(entry)  # evicted by another thread in between
+
+
+_INDEX_MAGIC = b"UTHIDX2\n"
+# Identifies the indexed log: st_dev, st_ino and a digest of its first line. The inode
+# alone is not enough, since a deleted and rewritten log often gets the same one back.
+_INDEX_HEADER = struct.Struct("<QQ8s")
+_INDEX_RECORD = 24  # offset (uint64), ts epoch (float64, NaN if absent), function_number (int64)
+_NO_FUNCTION = -1
+
+
+def _ts_to_epoch(value: Any) -> float:
+    """Epoch seconds for an ISO "ts" string, datetime or number; naive times are UTC."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+def _first_line_digest(mm: Optional[mmap.mmap]) -> bytes:
+    if mm is None:
+        return b""
+    end = mm.find(b"\n")
+    return hashlib.blake2b(mm[:end] if end >= 0 else b"", digest_size=8).digest()
+
+
+def _index_records(offsets: array, ts: array, functions: array) -> bytes:
+    records = array("Q", bytes(8 * 3 * len(offsets)))
+    view = memoryview(records)
+    view[0::3] = offsets
+    view.cast("B").cast("d")[1::3] = ts
+    view.cast("B").cast("q")[2::3] = functions
+    return records.tobytes()
+
+
+class HistoryReader:
+    """
+    Random-access reader for a JSONL history file. The file is memory-mapped and a
+    sidecar index (filename + ".idx") stores, per line, its byte offset, timestamp and
+    function_number, so tail/time-range/function queries only decode matching lines.
+    The index is extended incrementally by refresh() as lines are appended, and rebuilt
+    when its header (device, inode, first-line digest) no longer matches the file.
+    Results are (line_number, entry) pairs with 1-based line numbers; entry is None
+    for lines that are not valid JSON objects.
+    """
+
+    def __init__(self, filename: str = "utility_history.jsonl", index_filename: Optional[str] = None) -> None:
+        self.filename = filename
+        self.index_filename = index_filename or filename + ".idx"
+        self._offsets = array("Q")
+        self._ts = array("d")
+        self._functions = array("q")
+        self._indexed_size = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._index_header: Optional[Tuple[int, int, bytes]] = None  # from the loaded sidecar
+        self._mm: Optional[mmap.mmap] = None
+        self._load_index()
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __enter__(self) -> "HistoryReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_filename, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return
+        start = len(_INDEX_MAGIC) + _INDEX_HEADER.size
+        if not raw.startswith(_INDEX_MAGIC) or len(raw) < start:
+            return  # older format or truncated: rebuilt on refresh()
+        self._index_header = _INDEX_HEADER.unpack_from(raw, len(_INDEX_MAGIC))
+        body = memoryview(raw)[start:]
+        body = body[: len(body) - len(body) % _INDEX_RECORD]
+        if not body:
+            return
+        words = body.cast("Q")
+        self._offsets = array("Q", words[0::3])
+        self._ts = array("d", body.cast("d")[1::3])
+        self._functions = array("q", body.cast("q")[2::3])
+
+    def _remap(self, size: int) -> None:
+        self.close()
+        if size:
+            with open(self.filename, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _reset_index(self) -> None:
+        self._offsets, self._ts, self._functions = array("Q"), array("d"), array("q")
+        self._indexed_size = 0
+        try:
+            os.remove(self.index_filename)  # rewritten, with a fresh header, by _append_index
+        except OSError:
+            pass
+
+    def refresh(self) -> int:
+        """Map the current file and index any newly appended complete lines; return how many."""
+        try:
+            st = os.stat(self.filename)
+            size, file_id = st.st_size, (st.st_dev, st.st_ino)
+        except OSError:
+            size, file_id = 0, None
+        if self._file_id is not None and file_id != self._file_id:
+            self._reset_index()  # rotated or replaced by a new file
+        self._file_id = file_id
+        self._remap(size)
+        mm = self._mm
+        if self._offsets and self._indexed_size == 0:
+            # Index loaded from disk: it is only valid if it still matches the file.
+            last = self._offsets[-1]
+            end = mm.find(b"\n", last) if mm is not None and last < size else -1
+            if (
+                file_id is None
+                or self._index_header != (*file_id, _first_line_digest(mm))
+                or end < 0
+                or (last and mm[last - 1:last] != b"\n")
+            ):
+                self._reset_index()
+            else:
+                self._indexed_size = end + 1
+        elif size < self._indexed_size:
+            self._reset_index()  # truncated or replaced
+        if mm is None:
+            return 0
+        new_offsets, new_ts, new_functions = array("Q"), array("d"), array("q")
+        pos = self._indexed_size
+        while True:
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                break  # last line still being written
+            ts, fn = math.nan, _NO_FUNCTION
+            try:
+                entry = json.loads(mm[pos:end])
+            except ValueError:
+                entry = None
+            if isinstance(entry, dict):
+                ts = _ts_to_epoch(entry.get("ts"))
+                number = entry.get("function_number")
+                if isinstance(number, int) and not isinstance(number, bool):
+                    fn = number
+            new_offsets.append(pos)
+            new_ts.append(ts)
+            new_functions.append(fn)
+            pos = end + 1
+        self._indexed_size = pos
+        if new_offsets:
+            self._offsets.extend(new_offsets)
+            self._ts.extend(new_ts)
+            self._functions.extend(new_functions)
+            self._append_index(new_offsets, new_ts, new_functions)
+        return len(new_offsets)
+
+    def _append_index(self, offsets: array, ts: array, functions: array) -> None:
+        try:
+            if len(offsets) < len(self._offsets) and os.path.exists(self.index_filename):
+                # Append after the last whole record, dropping any partial one left on disk.
+                kept = len(_INDEX_MAGIC) + _INDEX_HEADER.size + (len(self._offsets) - len(offsets)) * _INDEX_RECORD
+                with open(self.index_filename, "r+b") as f:
+                    if f.seek(0, os.SEEK_END) >= kept:
+                        f.truncate(kept)
+                        f.seek(kept)
+                        f.write(_index_records(offsets, ts, functions))
+                        return
+            # New sidecar: header first, then every record indexed so far.
+            dev, ino = self._file_id or (0, 0)
+            with open(self.index_filename, "wb") as f:
+                f.write(_INDEX_MAGIC + _INDEX_HEADER.pack(dev, ino, _first_line_digest(self._mm)))
+                f.write(_index_records(self._offsets, self._ts, self._functions))
+        except OSError:
+            pass  # the in-memory index still works without the sidecar
+
+    def entry(self, line_number: int) -> Optional[Dict[str, Any]]:
+        """Decode one line by 1-based line number."""
+        if not 1 <= line_number <= len(self._offsets):
+            raise IndexError("line_number out of range")
+        start = self._offsets[line_number - 1]
+        end = self._mm.find(b"\n", start)
+        try:
+            entry = json.loads(self._mm[start:end])
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def _entries(self, line_numbers: Iterable[int]) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        return [(i, self.entry(i)) for i in line_numbers]
+
+    def tail(self, n: int = 10) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Return the last n lines."""
+        if not isinstance(n, int):
+            raise TypeError("n must be an integer")
+        total = len(self._offsets)
+        return self._entries(range(max(total - max(n, 0), 0) + 1, total + 1))
+
+    def between(self, start: Any = None, end: Any = None) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Return lines with start <= ts < end; bounds are datetimes, ISO strings or epoch seconds."""
+        lo = -math.inf if start is None else _ts_to_epoch(start)
+        hi = math.inf if end is None else _ts_to_epoch(end)
+        if math.isnan(lo) or math.isnan(hi):
+            raise ValueError("start and end must be datetimes, ISO strings or numbers")
+        return self._entries(i for i, ts in enumerate(self._ts, 1) if lo <= ts < hi)
+
+    def by_function(self, function_number: int) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Return lines logged for function_number."""
+        if not isinstance(function_number, int):
+            raise TypeError("function_number must be an integer")
+        return self._entries(i for i, fn in enumerate(self._functions, 1) if fn == function_number)
@@ -0,0 +1,666 @@
+"""
+Utility Toolkit - math helpers.
+Primes, factorials/binomials, Fibonacci, gcd/lcm (pairwise and array-wide) and discounts
+(single values and whole price columns).
+Kept free of heavy imports (typing is only needed by type checkers) so that
+short-lived workers importing just gcd or is_prime start fast.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from _thread import allocate_lock  # threading itself is too heavy to import here
+from array import array
+from itertools import compress, islice, repeat
+from operator import mul, ne, sub, truediv
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+    Number = Union[int, float]
+
+
+# -----------------------------
+# Prime engine
+# -----------------------------
+# Numbers below _SIEVE_LIMIT are answered from a cached odd-only sieve that grows
+# on demand; larger values go through Miller-Rabin (deterministic below
+# _MR_DETERMINISTIC_LIMIT) or Baillie-PSW above it.
+_SIEVE_LIMIT = 1 << 24
+_SIEVE_SEGMENT = 1 << 18
+_SMALL_PRIMES = (3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+# First 13 primes as witnesses: deterministic for every n below the smallest strong
+# pseudoprime to all of them, 3317044064679887385961981 (~3.3 * 10**24). Without 41
+# the bound drops to 318665857834031151167461 (~3.2 * 10**23), itself a pseudoprime.
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+
+def _sieve_segment(lo: int, hi: int, base_primes: Iterable[int]) -> bytearray:
+    """Return flags for the odd numbers lo, lo+2, ... < hi (lo odd); 1 means prime."""
+    count = len(range(lo, hi, 2))
+    flags = bytearray(b"\x01") * count
+    for p in base_primes:
+        if p * p >= hi:
+            break
+        start = max(p * p, (lo + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        idx = (start - lo) // 2
+        if idx < count:
+            flags[idx::p] = bytes(len(range(idx, count, p)))
+    if lo == 1 and count:
+        flags[0] = 0
+    return flags
+
+
+class _PrimeSieve:
+    """Growable odd-only sieve of Eratosthenes; flags[i] == 1 when 2*i + 1 is prime."""
+
+    def __init__(self) -> None:
+        self.limit = 0  # numbers < limit are covered; always even
+        self._flags = bytearray()
+        # Readers only look below limit, which is published after the flags it covers;
+        # growth itself is serialised so concurrent callers cannot append twice.
+        self._lock = allocate_lock()
+
+    def covers(self, n: int) -> bool:
+        return n < self.limit
+
+    def base_primes(self, bound: int) -> Iterable[int]:
+        """Yield cached odd primes <= bound (bound must be covered)."""
+        return compress(range(3, bound + 1, 2), self._flags[1:bound // 2 + 1])
+
+    def extend(self, limit: int) -> None:
+        """Grow the sieve so that every number < limit is covered. Thread-safe."""
+        limit = min(limit + (limit & 1), _SIEVE_LIMIT)
+        if limit <= self.limit:
+            return
+        with self._lock:
+            if limit > self.limit:  # another thread may have grown it meanwhile
+                self._extend_locked(limit)
+
+    def _extend_locked(self, limit: int) -> None:
+        root = math.isqrt(limit - 1)
+        if root >= 3 and root >= self.limit:
+            self._extend_locked(root + 2 - (root & 1))
+        for lo in range(self.limit, limit, _SIEVE_SEGMENT):
+            hi = min(lo + _SIEVE_SEGMENT, limit)
+            self._flags += _sieve_segment(lo + 1, hi, self.base_primes(math.isqrt(hi - 1)))
+        self.limit = limit
+
+    def contains(self, n: int) -> bool:
+        """Primality lookup for a covered n >= 2."""
+        return n == 2 or (n & 1 == 1 and self._flags[n >> 1] == 1)
+
+    def primes(self, lo: int, hi: int) -> List[int]:
+        """Return cached primes p with lo <= p < hi (hi must be covered)."""
+        out = [2] if lo <= 2 < hi else []
+        start = max(lo, 3) // 2
+        stop = hi // 2
+        out.extend(compress(range(2 * start + 1, 2 * stop + 1, 2), self._flags[start:stop]))
+        return out
+
+
+_PRIME_SIEVE = _PrimeSieve()
+
+
+def _miller_rabin(n: int, bases: Sequence[int] = _MR_BASES) -> bool:
+    """Strong probable-prime test of odd n > 47 with no small factors to each base."""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas(n: int) -> bool:
+    """Strong Lucas probable-prime test (Selfridge parameters) for odd n > 47."""
+    if math.isqrt(n) ** 2 == n:
+        return False  # no suitable D exists for perfect squares
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0:
+            return False  # |D| < n shares a factor with n
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # Left-to-right binary ladder for U_d, V_d and Q**d (mod n); halving is * inv2.
+    inv2 = (n + 1) // 2
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = (P * U + V) * inv2 % n, (D * U + P * V) * inv2 % n
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def _is_prime_unchecked(num: int) -> bool:
+    """Primality of an already validated int, routed through sieve or Miller-Rabin."""
+    if num < 2:
+        return False
+    if _PRIME_SIEVE.covers(num):
+        return _PRIME_SIEVE.contains(num)
+    # Grow the sieve only while doing so stays amortised; one-off big lookups
+    # are cheaper with Miller-Rabin than with a fresh sieve.
+    if num < _SIEVE_LIMIT and num < 2 * max(_PRIME_SIEVE.limit, 1 << 16):
+        _PRIME_SIEVE.extend(2 * num)
+        return _PRIME_SIEVE.contains(num)
+    if num % 2 == 0:
+        return False
+    for p in _SMALL_PRIMES:
+        if num % p == 0:
+            return num == p
+    if num < _MR_DETERMINISTIC_LIMIT:
+        return _miller_rabin(num)
+    # Baillie-PSW: no composite is known to pass it, but none is proven not to exist.
+    return _miller_rabin(num, (2,)) and _strong_lucas(num)
+
+
+def is_prime(num: int) -> bool:
+    """
+    Return True if num is a prime integer. Validate type and handle <2.
+    Exact below ~3.3 * 10**24; above that the Baillie-PSW test is used, which has no
+    known counterexample but is not proven.
+    """
+    if not isinstance(num, int):
+        raise TypeError("num must be an integer")
+    return _is_prime_unchecked(num)
+
+
+def is_prime_many(nums: Iterable[int]) -> List[bool]:
+    """Return is_prime for every item, growing the shared sieve once for the batch."""
+    try:
+        values = list(nums)
+    except TypeError:
+        raise TypeError("nums must be iterable")
+    small_max = 0
+    for x in values:
+        if not isinstance(x, int):
+            raise TypeError("all items must be integers")
+        if small_max < x < _SIEVE_LIMIT:
+            small_max = x
+    _PRIME_SIEVE.extend(small_max + 1)
+    return [_is_prime_unchecked(x) for x in values]
+
+
+def primes_in_range(lo: int, hi: int) -> List[int]:
+    """Return all primes p with lo <= p < hi, using a segmented sieve where possible."""
+    if not isinstance(lo, int) or not isinstance(hi, int):
+        raise TypeError("lo and hi must be integers")
+    lo = max(lo, 2)
+    if hi <= lo:
+        return []
+    if hi <= _SIEVE_LIMIT:
+        _PRIME_SIEVE.extend(hi)
+        return _PRIME_SIEVE.primes(lo, hi)
+    root = math.isqrt(hi - 1)
+    if root >= _SIEVE_LIMIT:
+        start = lo | 1
+        head = [2] if lo == 2 else []
+        return head + [n for n in range(start, hi, 2) if _is_prime_unchecked(n)]
+    _PRIME_SIEVE.extend(root + 1)
+    out = [2] if lo == 2 else []
+    for seg_lo in range(lo | 1, hi, 2 * _SIEVE_SEGMENT):
+        seg_hi = min(seg_lo + 2 * _SIEVE_SEGMENT, hi)
+        flags = _sieve_segment(seg_lo, seg_hi, _PRIME_SIEVE.base_primes(root))
+        out.extend(compress(range(seg_lo, seg_hi, 2), flags))
+    return out
+
+
+_FACTORIAL_CACHE_SIZE = 32
+_FACTORIAL_CACHE: Dict[int, int] = {}  # insertion order doubles as LRU order
+_FACTORIAL_LOCK = allocate_lock()
+
+
+def _range_product(lo: int, hi: int) -> int:
+    """Return lo * (lo+1) * ... * (hi-1) by binary splitting (balanced product tree)."""
+    if hi - lo <= 16:
+        result = 1
+        for i in range(lo, hi):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid, hi)
+
+
+def factorial(n: int) -> int:
+    """Product-tree factorial with an LRU memo. Raise for non-int or negative inputs."""
+    if not isinstance(n, int):
+        raise TypeError("n must be an integer")
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers.")
+    with _FACTORIAL_LOCK:
+        cached = _FACTORIAL_CACHE.pop(n, None)
+        if cached is not None:
+            _FACTORIAL_CACHE[n] = cached  # mark most recently used
+    if cached is not None:
+        return cached
+    # Resume from the closest smaller memoised factorial, so factorial(n+1)
+    # right after factorial(n) costs one multiplication.
+    # The memo is shared between threads: look up and update it under the lock,
+    # but multiply outside it.
+    with _FACTORIAL_LOCK:
+        base = max((m for m in _FACTORIAL_CACHE if m < n), default=1)
+        base_value = 1
+        if base > 1:
+            base_value = _FACTORIAL_CACHE.pop(base)
+            _FACTORIAL_CACHE[base] = base_value
+    result = _range_product(base + 1, n + 1) * base_value
+    with _FACTORIAL_LOCK:
+        _FACTORIAL_CACHE[n] = result
+        while len(_FACTORIAL_CACHE) > _FACTORIAL_CACHE_SIZE:
+            del _FACTORIAL_CACHE[next(iter(_FACTORIAL_CACHE))]
+    return result
+
+
+def factorial_mod(n: int, m: int) -> int:
+    """Return n! % m without building the full factorial. m must be a positive int."""
+    if not isinstance(n, int) or not isinstance(m, int):
+        raise TypeError("n and m must be integers")
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers.")
+    if m <= 0:
+        raise ValueError("m must be positive")
+    if n >= m:
+        return 0  # m itself is one of the factors
+    result = 1 % m
+    for i in range(2, n + 1):
+        result = result * i % m
+    return result
+
+
+def _binomial_small_mod(n: int, k: int, p: int) -> int:
+    """C(n, k) mod prime p for 0 <= n < p."""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    num = den = 1
+    for i in range(k):
+        num = num * (n - i) % p
+        den = den * (i + 1) % p
+    return num * pow(den, p - 2, p) % p
+
+
+def binomial(n: int, k: int, mod: Optional[int] = None) -> int:
+    """Return C(n, k), or C(n, k) % mod (Lucas' theorem when mod is prime)."""
+    if not isinstance(n, int) or not isinstance(k, int):
+        raise TypeError("n and k must be integers")
+    if n < 0 or k < 0:
+        raise ValueError("n and k must be non-negative")
+    if mod is None:
+        return math.comb(n, k)
+    if not isinstance(mod, int):
+        raise TypeError("mod must be an integer")
+    if mod <= 0:
+        raise ValueError("mod must be positive")
+    if k > n:
+        return 0
+    if mod == 1:
+        return 0
+    if not _is_prime_unchecked(mod):
+        return math.comb(n, k) % mod
+    result = 1
+    while n or k:
+        result = result * _binomial_small_mod(n % mod, k % mod, mod) % mod
+        if result == 0:
+            return 0
+        n //= mod
+        k //= mod
+    return result
+
+
+def _fib_pair(n: int) -> Tuple[int, int]:
+    """Return (F(n), F(n+1)) by fast doubling over the bits of n."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)  # F(2k)
+        d = a * a + b * b  # F(2k+1)
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibonacci_nth(n: int) -> int:
+    """Return F(n) in O(log n) multiplications (F(0) = 0). n must be non-negative int."""
+    if not isinstance(n, int):
+        raise TypeError("n must be an integer")
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return _fib_pair(n)[0]
+
+
+def iter_fibonacci(start: int = 0) -> Iterator[int]:
+    """Lazily yield F(start), F(start+1), ... without ever building a list."""
+    if not isinstance(start, int):
+        raise TypeError("start must be an integer")
+    if start < 0:
+        raise ValueError("start must be non-negative")
+    return _iter_fibonacci(start)
+
+
+def _iter_fibonacci(start: int) -> Iterator[int]:
+    a, b = _fib_pair(start)
+    while True:
+        yield a
+        a, b = b, a + b
+
+
+def fibonacci_range(start: int, stop: int) -> List[int]:
+    """Return [F(start), ..., F(stop-1)]; the window start is reached by doubling."""
+    if not isinstance(start, int) or not isinstance(stop, int):
+        raise TypeError("start and stop must be integers")
+    if start < 0:
+        raise ValueError("start must be non-negative")
+    if stop <= start:
+        return []
+    return list(islice(_iter_fibonacci(start), stop - start))
+
+
+def fibonacci(n: int) -> List[int]:
+    """Return first n Fibonacci numbers. n must be non-negative int."""
+    if not isinstance(n, int):
+        raise TypeError("n must be an integer")
+    if n <= 0:
+        return []
+    return fibonacci_range(0, n)
+
+
+def gcd(a: int, b: int) -> int:
+    """Return greatest common divisor. Validate integer inputs."""
+    if not isinstance(a, int) or not isinstance(b, int):
+        raise TypeError("a and b must be integers")
+    a, b = abs(a), abs(b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def lcm(a: int, b: int) -> int:
+    """Return least common multiple. Validate integer inputs."""
+    if not isinstance(a, int) or not isinstance(b, int):
+        raise TypeError("a and b must be integers")
+    if a == 0 or b == 0:
+        return 0
+    return abs(a * b) // gcd(a, b)
+
+
+# -----------------------------
+# Array-wide gcd/lcm
+# -----------------------------
+# math.gcd/math.lcm accept any number of arguments from Python 3.9; on 3.8 the
+# chunk is folded pairwise instead.
+_VARIADIC_GCD = hasattr(math, "lcm")
+_GCD_CHUNK = 4096
+
+
+def _gcd_chunk(values: List[int], g: int = 0) -> int:
+    """Return gcd(g, *values); stops at 1."""
+    try:
+        if _VARIADIC_GCD:
+            return math.gcd(g, *values)
+        for x in values:
+            g = math.gcd(g, x)
+            if g == 1:
+                break
+        return g
+    except TypeError:
+        raise TypeError("all items must be integers") from None
+
+
+def _lcm_chunk(values: List[int], m: int = 1) -> int:
+    """Return lcm(m, *values); stops at 0."""
+    try:
+        if _VARIADIC_GCD:
+            return math.lcm(m, *values)
+        for x in values:
+            if not m or not x:
+                math.gcd(0, x)  # still type-check x
+                return 0
+            m = abs(m * x) // math.gcd(m, x)
+        return m
+    except TypeError:
+        raise TypeError("all items must be integers") from None
+
+
+def _reduce_chunks(
+    values: Iterable[int],
+    chunk_fn: Callable[..., int],
+    start: int,
+    stop: int,
+    workers: Optional[int],
+    chunk_size: int,
+) -> int:
+    """Fold chunk_fn over values chunk by chunk, returning early once the result is stop."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or not isinstance(chunk_size, int):
+        raise TypeError("workers and chunk_size must be integers")
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be positive")
+    if isinstance(values, (str, bytes)) or not hasattr(values, "__iter__"):
+        raise TypeError("values must be an iterable of integers")
+
+    if isinstance(values, (list, tuple, array)):
+        chunks = (values[lo:lo + chunk_size] for lo in range(0, len(values), chunk_size))
+    else:
+        it = iter(values)
+        chunks = iter(lambda: list(islice(it, chunk_size)), [])
+
+    acc = start
+    if workers == 1:
+        for chunk in chunks:
+            acc = chunk_fn(chunk, acc)
+            if acc == stop:
+                break
+        return acc
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .collection_utils import _run_bounded
+
+    # At most 2 * workers chunks are in flight, which bounds the work wasted after an early exit.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in _run_bounded(executor, chunk_fn, ((chunk,) for chunk in chunks), 2 * workers):
+            acc = chunk_fn([partial], acc)
+            if acc == stop:
+                break
+    return acc
+
+
+def gcd_many(values: Iterable[int], workers: Optional[int] = 1, chunk_size: int = _GCD_CHUNK) -> int:
+    """
+    Return the gcd of all integers in values (0 if empty), stopping as soon as it reaches 1.
+    With workers > 1 (None = all CPUs), chunks are reduced across a process pool.
+    """
+    return _reduce_chunks(values, _gcd_chunk, 0, 1, workers, chunk_size)
+
+
+def lcm_many(values: Iterable[int], workers: Optional[int] = 1, chunk_size: int = _GCD_CHUNK) -> int:
+    """
+    Return the lcm of all integers in values (1 if empty), stopping as soon as it reaches 0.
+    With workers > 1 (None = all CPUs), chunks are reduced across a process pool.
+    """
+    return _reduce_chunks(values, _lcm_chunk, 1, 0, workers, chunk_size)
+
+
+def gcd_pairs(a_seq: Sequence[int], b_seq: Sequence[int]) -> Any:
+    """
+    Return the elementwise gcd of two equal-length integer sequences as a list
+    (a NumPy array when both inputs are NumPy arrays; NumPy is optional).
+    """
+    try:
+        if len(a_seq) != len(b_seq):
+            raise ValueError("a_seq and b_seq must have the same length")
+    except TypeError:
+        raise TypeError("a_seq and b_seq must be sequences") from None
+    if type(a_seq).__module__ == "numpy" and type(b_seq).__module__ == "numpy":
+        import numpy  # already imported by whoever built the arrays
+
+        return numpy.gcd(a_seq, b_seq)
+    try:
+        return list(map(math.gcd, a_seq, b_seq))
+    except TypeError:
+        raise TypeError("all items must be integers") from None
+
+
+def apply_discount(price: Number, discount: Number) -> float:
+    """Apply percent discount (0-100). Validate numeric inputs."""
+    if not isinstance(price, (int, float)) or not isinstance(discount, (int, float)):
+        raise TypeError("price and discount must be numbers")
+    if discount < 0 or discount > 100:
+        raise ValueError("Discount must be between 0 and 100.")
+    return float(price * (1 - discount / 100.0))
+
+
+_EXACT_NUMBER_TYPES = frozenset((int, float, bool))
+_DISCOUNT_CHUNK = 1 << 16  # rows converted per slice assignment into a caller's out buffer
+
+
+def _numeric_column(values: Any, name: str) -> Any:
+    """Return values as an array, list or tuple (other iterables are materialized)."""
+    if isinstance(values, (str, bytes)) or not hasattr(values, "__iter__"):
+        raise TypeError(f"{name} must be a sequence of numbers")
+    if isinstance(values, array):
+        return values
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    return values
+
+
+def _is_trusted(values: Any) -> bool:
+    """True when every item is a plain int/float, so rows need no per-item isinstance."""
+    if isinstance(values, array):
+        return values.typecode in "bBhHiIlLqQfd"
+    return set(map(type, values)) <= _EXACT_NUMBER_TYPES
+
+
+def apply_discount_many(prices: Any, discounts: Any, out: Any = None) -> Tuple[Any, int]:
+    """
+    apply_discount over a column: discounts is one number or a per-row column.
+    Returns (results, rejected). Rows with a non-numeric price or discount, or a discount
+    outside 0-100, become NaN and are counted instead of raising. Results are written into
+    out when given (len(prices) floats, e.g. array('d') or a NumPy array), else a new
+    array('d') (a NumPy array for NumPy prices).
+    """
+    per_row = not isinstance(discounts, (int, float))
+    if not per_row and not 0 <= discounts <= 100:
+        raise ValueError("Discount must be between 0 and 100.")
+    if type(prices).__module__ == "numpy":
+        return _apply_discount_numpy(prices, discounts, out)
+
+    prices = _numeric_column(prices, "prices")
+    n = len(prices)
+    if per_row:
+        discounts = _numeric_column(discounts, "discounts")
+        if len(discounts) != n:
+            raise ValueError("prices and discounts must have the same length")
+    if out is not None:
+        if isinstance(out, array) and out.typecode not in "fd":
+            raise TypeError("out must hold floats")
+        if len(out) != n:
+            raise ValueError("out must have the same length as prices")
+
+    rejected = 0
+    values = None
+    if not per_row and _is_trusted(prices):
+        values = map(mul, prices, repeat(1 - discounts / 100.0))
+    elif (
+        per_row
+        and _is_trusted(prices)
+        and _is_trusted(discounts)
+        and not any(map(ne, discounts, discounts))  # NaN
+        and (not n or (0 <= min(discounts) and max(discounts) <= 100))
+    ):
+        factors = map(sub, repeat(1), map(truediv, discounts, repeat(100.0)))
+        values = map(mul, prices, factors)
+    if values is not None:
+        if out is None:
+            return array("d", values), rejected
+        # Fill out a bounded chunk at a time, converted to its own item type, so the
+        # caller's buffer is the only full-size allocation.
+        typecode = out.typecode if isinstance(out, array) else None
+        for lo in range(0, n, _DISCOUNT_CHUNK):
+            hi = min(lo + _DISCOUNT_CHUNK, n)
+            chunk = islice(values, hi - lo)
+            out[lo:hi] = array(typecode, chunk) if typecode else list(chunk)
+        return out, rejected
+
+    # Slow path: mixed or invalid rows, checked one by one like apply_discount.
+    results = array("d", bytes(8 * n)) if out is None else out
+    discount_column = discounts if per_row else repeat(discounts)
+    for i, price, discount in zip(range(n), prices, discount_column):
+        if (
+            isinstance(price, (int, float))
+            and isinstance(discount, (int, float))
+            and 0 <= discount <= 100
+        ):
+            results[i] = price * (1 - discount / 100.0)
+        else:
+            results[i] = math.nan
+            rejected += 1
+    return results, rejected
+
+
+def _apply_discount_numpy(prices: Any, discounts: Any, out: Any) -> Tuple[Any, int]:
+    """apply_discount_many for NumPy prices, using ndarray operations only."""
+    import numpy  # already imported by whoever built prices
+
+    if prices.dtype.kind not in "biuf":
+        raise TypeError("prices must be a numeric array")
+    discounts = numpy.asarray(discounts, dtype=float)
+    if discounts.ndim and discounts.shape != prices.shape:
+        raise ValueError("prices and discounts must have the same length")
+    valid = (discounts >= 0) & (discounts <= 100)  # False for NaN
+    factors = numpy.where(valid, 1 - discounts / 100.0, numpy.nan)
+    if out is not None and out.shape != prices.shape:
+        raise ValueError("out must have the same length as prices")
+    results = numpy.multiply(prices, factors, out=out)
+    rejected = int(valid.size - numpy.count_nonzero(valid)) if discounts.ndim else 0
+    return results, rejected
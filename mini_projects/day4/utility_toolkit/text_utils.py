@@ -0,0 +1,327 @@
+"""
+Utility Toolkit - string and text helpers, including streaming tokenizers.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+def count_vowels(s: str) -> int:
+    """Count vowels (a,e,i,o,u) case-insensitive. Validate input string."""
+    if not isinstance(s, str):
+        raise TypeError("s must be a string")
+    return sum(1 for ch in s.lower() if ch in "aeiou")
+
+
+def reverse_string(s: str) -> str:
+    """Return reversed string. Validate input string."""
+    if not isinstance(s, str):
+        raise TypeError("s must be a string")
+    return s[::-1]
+
+
+# -----------------------------
+# Palindromes
+# -----------------------------
+# is_palindrome compares lowercased alphanumerics. ASCII blocks are cleaned with one
+# translate() call; anything else falls back to per-character str methods.
+_ASCII_NOT_ALNUM = bytes(c for c in range(128) if not chr(c).isalnum())
+_ASCII_UPPER = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_ASCII_CLEAN_BYTES = bytes.maketrans(_ASCII_UPPER, _ASCII_UPPER.lower())
+_ASCII_CLEAN_STR = dict.fromkeys(_ASCII_NOT_ALNUM)
+_ASCII_CLEAN_STR.update(zip(_ASCII_UPPER, _ASCII_UPPER.lower()))
+_PALINDROME_BLOCK = 1 << 14
+
+
+def _clean_alnum(text: str) -> str:
+    """Lowercased alphanumeric characters of text."""
+    if text.isascii():
+        return text.translate(_ASCII_CLEAN_STR)
+    return "".join(ch.lower() for ch in text if ch.isalnum())
+
+
+def _clean_alnum_utf8(data: bytes) -> str:
+    """_clean_alnum for a block of UTF-8 bytes that starts and ends on character boundaries."""
+    if data.isascii():
+        return data.translate(_ASCII_CLEAN_BYTES, _ASCII_NOT_ALNUM).decode("ascii")
+    return _clean_alnum(data.decode("utf-8"))
+
+
+def _palindrome_two_pointer(
+    size: int, clean: Callable[[int, int], str], boundary: Callable[[int], int]
+) -> bool:
+    """
+    Two-pointer palindrome check over positions [0, size), cleaned a block at a time.
+    clean(lo, hi) returns the cleaned text of a span; boundary(p) moves p forward to
+    the next position a span may start or end at. Only O(block) text is held at once.
+    """
+    lo, hi = 0, size
+    left = right = ""  # cleaned, not yet matched: left in reading order, right reversed
+    while lo < hi:
+        if not left:
+            mid = boundary(min(lo + _PALINDROME_BLOCK, hi))
+            left, lo = clean(lo, mid), mid
+        else:
+            mid = boundary(max(hi - _PALINDROME_BLOCK, lo))
+            right, hi = clean(mid, hi)[::-1], mid
+        n = min(len(left), len(right))
+        if left[:n] != right[:n]:
+            return False
+        left, right = left[n:], right[n:]
+    # Whatever is left unmatched is the middle of the cleaned text.
+    middle = left or right
+    return middle == middle[::-1]
+
+
+def is_palindrome(s: str) -> bool:
+    """Return True if s is palindrome (alphanumeric only), case-insensitive."""
+    if not isinstance(s, str):
+        raise TypeError("s must be a string")
+    return _palindrome_two_pointer(len(s), lambda lo, hi: _clean_alnum(s[lo:hi]), int)
+
+
+def is_palindrome_file(path: str) -> bool:
+    """
+    is_palindrome for a UTF-8 text file, memory-mapped and compared from both ends,
+    so memory use stays bounded and a mismatch near the ends returns early.
+    """
+    import mmap
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+            def boundary(pos: int) -> int:
+                while pos < size and 0x80 <= mm[pos] < 0xC0:  # UTF-8 continuation byte
+                    pos += 1
+                return pos
+
+            return _palindrome_two_pointer(size, lambda lo, hi: _clean_alnum_utf8(mm[lo:hi]), boundary)
+
+
+def longest_palindromic_substring(s: str) -> str:
+    """
+    Return the longest palindromic substring of s (exact characters; the first one on
+    ties), using Manacher's algorithm in O(len(s)).
+    """
+    if not isinstance(s, str):
+        raise TypeError("s must be a string")
+    if len(s) < 2 or s == s[::-1]:
+        return s
+    # Interleave separators so even and odd palindromes share one radius array:
+    # "aba" -> [None, #, a, #, b, #, a, #, 0]. The end sentinels differ from each
+    # other and from every character, so expansion stops without bounds checks.
+    t = [None, "#", *"#".join(s), "#", 0]
+    radius = [0] * len(t)
+    center = right = 0
+    for i in range(1, len(t) - 1):
+        r = min(right - i, radius[2 * center - i]) if i < right else 0
+        while t[i + r + 1] == t[i - r - 1]:
+            r += 1
+        radius[i] = r
+        if i + r > right:
+            center, right = i, i + r
+    best = max(radius)
+    start = (radius.index(best) - 1 - best) // 2
+    return s[start:start + best]
+
+
+# Same characters as string.punctuation, spelled out so importing this module
+# does not pull in string (and, through it, re).
+_PUNCTUATION = "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
+_PUNCT_TRANSLATOR = str.maketrans("", "", _PUNCTUATION)
+
+
+def clean_text(text: str) -> str:
+    """Lowercase and remove punctuation from text."""
+    if not isinstance(text, str):
+        raise TypeError("text must be a string")
+    return text.translate(_PUNCT_TRANSLATOR).lower().strip()
+
+
+def sentence_to_words(sentence: str) -> List[str]:
+    """Split sentence into cleaned words."""
+    if not isinstance(sentence, str):
+        raise TypeError("sentence must be a string")
+    return sentence.translate(_PUNCT_TRANSLATOR).lower().split()
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Lazily yield sentence_to_words tokens for each line; words never span lines."""
+    try:
+        iterator = iter(lines)
+    except TypeError:
+        raise TypeError("lines must be iterable")
+    return _tokenize_lines(iterator)
+
+
+def _tokenize_lines(iterator: Iterator[str]) -> Iterator[str]:
+    table = _PUNCT_TRANSLATOR
+    for line in iterator:
+        if not isinstance(line, str):
+            raise TypeError("all lines must be strings")
+        yield from line.translate(table).lower().split()
+
+
+def _tokenize_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Tokenize a stream of text blocks, re-joining words split at block boundaries."""
+    table = _PUNCT_TRANSLATOR
+    carry = ""
+    for chunk in chunks:
+        cleaned = chunk.translate(table).lower()
+        if not cleaned:
+            continue
+        words = cleaned.split()
+        if carry:
+            if cleaned[0].isspace():
+                yield carry
+            else:
+                words[0] = carry + words[0]
+            carry = ""
+        if words and not cleaned[-1].isspace():
+            carry = words.pop()
+        yield from words
+    if carry:
+        yield carry
+
+
+def tokenize_file(path: str, chunk_size: int = 1 << 20, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Lazily yield sentence_to_words tokens of a text file read in chunk_size blocks,
+    so memory use is bounded by the block size rather than the file size.
+    """
+    if not isinstance(chunk_size, int):
+        raise TypeError("chunk_size must be an integer")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    return _tokenize_file(path, chunk_size, encoding)
+
+
+def _tokenize_file(path: str, chunk_size: int, encoding: str) -> Iterator[str]:
+    with open(path, "r", encoding=encoding) as f:
+        yield from _tokenize_chunks(iter(lambda: f.read(chunk_size), ""))
+
+
+# -----------------------------
+# Numeric list parsing
+# -----------------------------
+# Token kinds for _number_kind: decimal literals only (no underscores, inf/nan, hex, ...);
+# anything else is left to ast.literal_eval / int() / float() by the callers.
+_NOT_A_NUMBER, _INT, _PADDED_INT, _FLOAT = 0, 1, 2, 3
+_INT_TYPECODES = "bBhHiIlLqQ"
+
+
+def _number_kind(token: str) -> int:
+    """Classify one non-empty ASCII token without raising."""
+    body = token[1:] if token[0] in "+-" else token
+    if body.isdigit():
+        # "01" is an int() but not a Python literal; "0" and "00" are both.
+        return _PADDED_INT if body[0] == "0" and body.strip("0") else _INT
+    if body.replace(".", "", 1).isdigit():  # "1.5", ".5", "5."
+        return _FLOAT
+    mantissa, e, exponent = body.replace("E", "e").partition("e")
+    if not e:
+        return _NOT_A_NUMBER
+    if exponent[:1] in ("+", "-"):
+        exponent = exponent[1:]
+    if exponent.isdigit() and mantissa.replace(".", "", 1).isdigit():
+        return _FLOAT
+    return _NOT_A_NUMBER
+
+
+_DIGITS_TO_ONE = str.maketrans("23456789", "11111111")
+
+
+def _all_plain_ints(tokens: List[str], allow_padded: bool) -> bool:
+    """Whole-list check for the common all-int case, using C-level string passes only."""
+    joined = " " + " ".join(tokens)
+    if "--" in joined or "-+" in joined or "+-" in joined or "++" in joined:
+        return False
+    unsigned = joined.replace(" -", " ").replace(" +", " ")
+    # A lone sign leaves an empty token behind: a double or trailing space.
+    if "  " in unsigned or unsigned.endswith(" "):
+        return False
+    if not unsigned.replace(" ", "").isdigit():
+        return False
+    if allow_padded:
+        return True
+    # " 00"/" 01" marks a token starting with 0 and longer than one digit: let
+    # _number_kind tell zero padding ("01") from plain zeros ("00").
+    normalized = unsigned.translate(_DIGITS_TO_ONE)
+    return " 00" not in normalized and " 01" not in normalized
+
+
+def _scan_numbers(text: str, literal: bool) -> Optional[Tuple[List[str], Optional[List[int]]]]:
+    """
+    Split a bracketed comma-separated list ("[1, 2.5]") or whitespace-separated numbers
+    into tokens and their kinds (None when all are ints); None unless every token is a number.
+    literal=True rejects zero-padded ints inside brackets, as Python literals do.
+    """
+    if not text.isascii():
+        return None
+    body = text.strip()
+    bracketed = body[:1] in ("[", "(") and body[-1:] == ("]" if body[0] == "[" else ")")
+    if bracketed:
+        parts = body[1:-1].split(",")
+        if len(parts) > 1 and not parts[-1].strip():
+            parts.pop()  # trailing comma
+        if any(len(part.split()) != 1 for part in parts):  # empty items or spaces inside an item
+            return None
+        tokens = [part.strip() for part in parts]
+    elif "," in body:
+        return None
+    else:
+        tokens = body.split()
+    strict = literal and bracketed
+    if tokens and _all_plain_ints(tokens, allow_padded=not strict):
+        return tokens, None
+    kinds = list(map(_number_kind, tokens))
+    if _NOT_A_NUMBER in kinds or (strict and _PADDED_INT in kinds):
+        return None
+    return tokens, kinds
+
+
+def _numbers_from_tokens(tokens: List[str], kinds: Optional[List[int]]) -> List[Union[int, float]]:
+    """Convert scanned tokens: ints stay int, everything else becomes float."""
+    if kinds is None or _FLOAT not in kinds:
+        return list(map(int, tokens))
+    if _INT not in kinds and _PADDED_INT not in kinds:
+        return list(map(float, tokens))
+    return [float(t) if k == _FLOAT else int(t) for t, k in zip(tokens, kinds)]
+
+
+def parse_numbers(text: str, typecode: Optional[str] = None) -> array:
+    """
+    Parse "[1, 2, 3.5]" / "(1, 2)" / "1 2 3.5" straight into an array without
+    ast.literal_eval. typecode defaults to 'q' when every number is an int that fits,
+    else 'd'. Raise ValueError if text is not a flat list of decimal numbers.
+    """
+    if not isinstance(text, str):
+        raise TypeError("text must be a string")
+    if typecode is not None and typecode not in _INT_TYPECODES + "fd":
+        raise ValueError("typecode must be a numeric array typecode")
+    scanned = _scan_numbers(text, literal=False)
+    if scanned is None:
+        raise ValueError("text is not a list of numbers")
+    tokens, kinds = scanned
+    all_ints = kinds is None or _FLOAT not in kinds
+    if typecode is None:
+        typecode = "q" if all_ints else "d"
+        if all_ints:
+            try:
+                return array("q", map(int, tokens))
+            except OverflowError:
+                typecode = "d"
+    elif typecode in _INT_TYPECODES and not all_ints:
+        raise ValueError("text contains non-integer numbers")
+    if typecode in "fd":
+        return array(typecode, map(float, tokens))
+    return array(typecode, map(int, tokens))
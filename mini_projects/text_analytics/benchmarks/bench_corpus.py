@@ -0,0 +1,64 @@
+"""
+Scaling benchmark for scan_corpus: many small documents and one big file,
+counted with 1/2/4/8 worker processes, against a sequential scan_text loop.
+
+Run from the repository root:
+    python mini_projects/text_analytics/benchmarks/bench_corpus.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mini_project_day2 import expand_paths, scan_corpus, scan_file, scan_text  # noqa: E402
+
+
+def write_corpus(root, vocab, n_docs, doc_words, big_words):
+    rng = random.Random(0)
+    docs = os.path.join(root, "docs")
+    os.mkdir(docs)
+    for i in range(n_docs):
+        with open(os.path.join(docs, f"doc{i:05d}.txt"), "w", encoding="utf-8") as f:
+            f.write(" ".join(rng.choices(vocab, k=doc_words)) + ".\n")
+    big = os.path.join(root, "big.txt")
+    with open(big, "w", encoding="utf-8") as f:
+        for _ in range(big_words // 1000):
+            f.write(" ".join(rng.choices(vocab, k=1000)) + ".\n")
+    return docs, big
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:22s} {time.perf_counter() - start:7.2f}s")
+    return result
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    vocab = ["".join(rng.choices("abcdefghijklmnop", k=rng.randint(2, 9))) for _ in range(20_000)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        docs, big = write_corpus(tmpdir, vocab, n_docs=2000, doc_words=500, big_words=6_000_000)
+        doc_paths = list(expand_paths([docs]))
+        print(f"cpus: {os.cpu_count()}")
+
+        print(f"{len(doc_paths)} documents, {sum(map(os.path.getsize, doc_paths)) / 1e6:.1f} MB")
+
+        def sequential():
+            for path in doc_paths:
+                with open(path, encoding="utf-8") as f:
+                    scan_text(f.read())
+
+        timed("scan_text loop", sequential)
+        for workers in (1, 2, 4, 8):
+            timed(f"scan_corpus workers={workers}", lambda: scan_corpus(doc_paths, workers=workers))
+
+        print(f"1 file, {os.path.getsize(big) / 1e6:.1f} MB, split into 4 MiB ranges")
+        timed("scan_file", lambda: scan_file(big))
+        for workers in (1, 2, 4, 8):
+            timed(f"scan_corpus workers={workers}",
+                  lambda: scan_corpus([big], workers=workers, split_bytes=4 << 20))
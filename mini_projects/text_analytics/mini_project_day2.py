@@ -1,69 +1,455 @@
+import argparse
+import codecs
+import os
 import string
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice
+from operator import itemgetter
+
+try:
+    from .sketches import WordSketch
+except ImportError:  # run as a script: python mini_project_day2.py
+    from sketches import WordSketch
+
+PUNCT_TRANSLATOR = str.maketrans('', '', string.punctuation)
+
 
 def clean_text(text):
     text = text.lower()
-    translator = str.maketrans('', '', string.punctuation)
-    return text.translate(translator)
+    return text.translate(PUNCT_TRANSLATOR)
+
 
-def scan_text(paragraph):
-    cleaned = clean_text(paragraph)
-    words = cleaned.split()
+def words_with_count(frequency, count):
+    # compress() filters the keys by a parallel pass over the values, all in C.
+    return list(compress(frequency, map(count.__eq__, frequency.values())))
 
-    words_list = words
-    unique_words = set(words)
-    frequency = Counter(words)
 
+def summarize(frequency, words_list=None):
     if frequency:
         # ----- MOST FREQUENT WORDS -----
-        max_count = max(frequency.values())
-        most_common_words = [word for word, count in frequency.items() if count == max_count]
+        most_common_words = words_with_count(frequency, max(frequency.values()))
 
         # ----- LEAST FREQUENT WORDS -----
-        min_count = min(frequency.values())
-        least_common_words = [word for word, count in frequency.items() if count == min_count]
+        least_common_words = words_with_count(frequency, min(frequency.values()))
     else:
         most_common_words = []
         least_common_words = []
 
-    total_words = len(words_list)
-    total_unique_words = len(unique_words)
+    # The vocabulary is stored once: "frequency" is the Counter itself and "unique_words"
+    # a live view of its keys, instead of a set and a dict copied from it.
+    return {
+        "words_list": words_list,                 # None unless the caller kept the words
+        "unique_words": frequency.keys(),
+        "frequency": frequency,
+        "most_frequent": most_common_words,
+        "least_frequent": least_common_words,
+        "total_words": sum(frequency.values()),
+        "total_unique_words": len(frequency)
+    }
+
+
+# ----- RANKING -----
+def select_by_count(frequency, n, largest=True):
+    # Count buckets instead of a heap: a histogram of the counts (count -> how many words
+    # have it) finds the cut-off count; words beyond it are picked and sorted, and the
+    # cut-off's ties are filled in first-seen order. Every pass over the V words runs in C,
+    # and only the n picked words are sorted.
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    values = frequency.values()
+    histogram = Counter(values)
+    remaining = n
+    for threshold in sorted(histogram, reverse=largest):
+        if histogram[threshold] >= remaining:
+            break
+        remaining -= histogram[threshold]
+    else:
+        return sorted(frequency.items(), key=itemgetter(1), reverse=largest)
+    if remaining == 0:
+        return []
+    beyond = threshold.__lt__ if largest else threshold.__gt__
+    picked = [(word, frequency[word]) for word in compress(frequency, map(beyond, values))]
+    picked.sort(key=itemgetter(1), reverse=largest)
+    ties = islice(compress(frequency, map(threshold.__eq__, values)), remaining)
+    picked.extend((word, threshold) for word in ties)
+    return picked
+
+
+def top_n(frequency, n):
+    # The n most frequent (word, count) pairs, highest first. Equal counts keep
+    # first-seen order, like Counter.most_common(n), so ties are deterministic.
+    return select_by_count(frequency, n, largest=True)
+
 
+def bottom_n(frequency, n):
+    # The n least frequent (word, count) pairs, lowest first; equal counts in first-seen order.
+    return select_by_count(frequency, n, largest=False)
+
+
+def summarize_sketch(sketch, words_list=None):
+    # Approximate mode: same keys as summarize, but only what a fixed-size sketch can
+    # answer. "frequency" holds the heavy hitters' estimated counts, the unique-word set
+    # and least_frequent are not available (None), total_unique_words is an estimate.
+    top = sketch.top()
+    max_count = top[0][1] if top else 0
     return {
         "words_list": words_list,
-        "unique_words": unique_words,
-        "frequency": dict(frequency),
-        "most_frequent": most_common_words,       # UPDATED
-        "least_frequent": least_common_words,     # UPDATED
-        "total_words": total_words,
-        "total_unique_words": total_unique_words
+        "unique_words": None,
+        "frequency": dict(top),
+        "most_frequent": [word for word, count in top if count == max_count],
+        "least_frequent": None,
+        "total_words": sketch.total_words,
+        "total_unique_words": sketch.distinct.count() if top else 0,
+        "sketch": sketch
     }
 
-def report(data):
+
+def scan_text(paragraph, approximate=False):
+    words = clean_text(paragraph).split()
+    if approximate:
+        sketch = WordSketch()
+        sketch.update(words)
+        return summarize_sketch(sketch, words)
+    return summarize(Counter(words), words)
+
+
+def iter_word_batches(chunks):
+    # Yields the words of each chunk as one list. A chunk may cut a word in two,
+    # so the last partial word is held back and joined with the next chunk.
+    carry = ""
+    for chunk in chunks:
+        cleaned = clean_text(chunk)
+        if not cleaned:
+            continue
+        words = cleaned.split()
+        if carry:
+            if cleaned[0].isspace():
+                yield [carry]
+            else:
+                words[0] = carry + words[0]
+            carry = ""
+        if words and not cleaned[-1].isspace():
+            carry = words.pop()
+        yield words
+    if carry:
+        yield [carry]
+
+
+def scan_stream(chunks, keep_words=False, approximate=False):
+    # One Counter, updated a chunk at a time: memory grows with the vocabulary, not the corpus.
+    # approximate=True updates a WordSketch instead, whose memory is fixed.
+    if approximate:
+        if keep_words:
+            raise ValueError("keep_words is only supported in exact mode")
+        sketch = WordSketch()
+        for words in iter_word_batches(chunks):
+            sketch.update(words)
+        return summarize_sketch(sketch)
+    frequency = Counter()
+    words_list = [] if keep_words else None
+    for words in iter_word_batches(chunks):
+        frequency.update(words)
+        if keep_words:
+            words_list.extend(words)
+    return summarize(frequency, words_list)
+
+
+def scan_file(path, keep_words=False, chunk_size=1 << 20, encoding="utf-8", approximate=False):
+    with open(path, "r", encoding=encoding) as f:
+        return scan_stream(iter(lambda: f.read(chunk_size), ""), keep_words=keep_words,
+                           approximate=approximate)
+
+
+# ----- PARALLEL CORPUS SCAN -----
+SPLIT_BYTES = 8 << 20          # files bigger than this are counted in byte ranges
+READ_BYTES = 1 << 20
+ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def next_word_boundary(f, offset, size):
+    # First position after an ASCII whitespace byte at or past offset. Those bytes never
+    # occur inside a UTF-8 character, so ranges cut there split neither words nor characters.
+    f.seek(offset)
+    while offset < size:
+        block = f.read(4096)
+        for i, byte in enumerate(block):
+            if byte in ASCII_WHITESPACE:
+                return offset + i + 1
+        offset += len(block)
+    return size
+
+
+def plan_ranges(path, split_bytes):
+    size = os.path.getsize(path)
+    if size <= split_bytes:
+        return [(path, 0, size)]
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = next_word_boundary(f, start + split_bytes, size)
+            ranges.append((path, start, end))
+            start = end
+    return ranges
+
+
+def iter_range_words(path, start, end, encoding="utf-8"):
+    # Word lists of bytes [start, end) of a file; start and end must be word boundaries.
+    if end - start <= READ_BYTES:
+        with open(path, "rb") as f:
+            f.seek(start)
+            yield clean_text(f.read(end - start).decode(encoding)).split()
+        return
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    def chunks():
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = f.read(min(READ_BYTES, remaining))
+                if not block:
+                    break
+                remaining -= len(block)
+                yield decoder.decode(block)
+        yield decoder.decode(b"", final=True)
+
+    yield from iter_word_batches(chunks())
+
+
+def count_range(path, start, end, encoding="utf-8"):
+    frequency = Counter()
+    for words in iter_range_words(path, start, end, encoding):
+        frequency.update(words)
+    return frequency
+
+
+def file_stats(frequency):
+    # Per-file entries keep the totals and extremes, not a full frequency table per file.
+    counts = frequency.values()
+    return {
+        "most_frequent": words_with_count(frequency, max(counts)) if frequency else [],
+        "least_frequent": words_with_count(frequency, min(counts)) if frequency else [],
+        "total_words": sum(counts),
+        "total_unique_words": len(frequency)
+    }
+
+
+def count_task(task):
+    # One task is either a batch of whole files or a single range of a big file.
+    # Returns ({path: file_stats} for the whole files, the task's merged Counter),
+    # or in approximate mode ({path: {"total_words"}}, the task's WordSketch).
+    ranges, encoding, approximate = task
+    if approximate:
+        return sketch_task(ranges, encoding)
+    if len(ranges) == 1 and not ranges[0][3]:
+        return {}, count_range(*ranges[0][:3], encoding)
+    stats = {}
+    total = Counter()
+    for path, start, end, _ in ranges:
+        frequency = Counter()
+        for words in iter_range_words(path, start, end, encoding):
+            # Counting the word list twice is cheaper than total.update(frequency):
+            # Counter.update only takes the C fast path for iterables, not mappings.
+            frequency.update(words)
+            total.update(words)
+        stats[path] = file_stats(frequency)
+    return stats, total
+
+
+def sketch_task(ranges, encoding):
+    sketch = WordSketch()
+    stats = {}
+    for path, start, end, whole in ranges:
+        before = sketch.total_words
+        for words in iter_range_words(path, start, end, encoding):
+            sketch.update(words)
+        if whole:
+            stats[path] = {"total_words": sketch.total_words - before}
+    return stats, sketch
+
+
+def plan_tasks(paths, split_bytes):
+    # Small files are batched up to split_bytes per task; big files get one task per range.
+    tasks = []
+    batch, batch_bytes = [], 0
+    for path in paths:
+        ranges = plan_ranges(path, split_bytes)
+        if len(ranges) == 1:
+            path, start, end = ranges[0]
+            batch.append((path, start, end, True))
+            batch_bytes += end
+            if batch_bytes >= split_bytes:
+                tasks.append(batch)
+                batch, batch_bytes = [], 0
+            continue
+        if batch:
+            tasks.append(batch)
+            batch, batch_bytes = [], 0
+        tasks.extend([(path, start, end, False)] for path, start, end in ranges)
+    if batch:
+        tasks.append(batch)
+    return tasks
+
+
+def merge_counters(counters, combine=Counter.update, empty=Counter):
+    # Pairwise tree reduction. The left partner always absorbs the right one, so the
+    # merged key order is first-seen order, as if the parts had been scanned in sequence.
+    # Sketches are merged the same way with combine=WordSketch.merge.
+    counters = list(counters)
+    if not counters:
+        return empty()
+    while len(counters) > 1:
+        merged = []
+        for i in range(0, len(counters) - 1, 2):
+            combine(counters[i], counters[i + 1])
+            merged.append(counters[i])
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    return counters[0]
+
+
+def scan_corpus(paths, workers=None, split_bytes=SPLIT_BYTES, encoding="utf-8", approximate=False):
+    # Map: count batches of files, or word-aligned byte ranges of big files, in a process pool.
+    # Reduce: tree-merge the partial Counters (a big file's ranges first, to get its stats).
+    # Returns scan_text's keys for the whole corpus (words_list is None), plus
+    # "per_file": {path: {total_words, total_unique_words, most_frequent, least_frequent}}.
+    # approximate=True merges WordSketches instead; per-file entries then only have total_words.
+    tasks = [(ranges, encoding, approximate) for ranges in plan_tasks(paths, split_bytes)]
+    if approximate:
+        def merge(parts):
+            return merge_counters(parts, WordSketch.merge, WordSketch)
+
+        def stats_of(sketch):
+            return {"total_words": sketch.total_words}
+    else:
+        merge, stats_of = merge_counters, file_stats
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        results = list(map(count_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(count_task, tasks))
+
+    per_file = {}
+    partials = []
+    split_path, split_parts = None, []
+    for (ranges, _, _), (stats, frequency) in zip(tasks, results):
+        path, _, _, whole = ranges[0]
+        if split_parts and (whole or path != split_path):
+            merged = merge(split_parts)
+            per_file[split_path] = stats_of(merged)
+            partials.append(merged)
+            split_parts = []
+        if whole:
+            per_file.update(stats)
+            partials.append(frequency)
+        else:
+            split_path = path
+            split_parts.append(frequency)
+    if split_parts:
+        merged = merge(split_parts)
+        per_file[split_path] = stats_of(merged)
+        partials.append(merged)
+
+    if approximate:
+        data = summarize_sketch(merge(partials))
+    else:
+        data = summarize(merge(partials))
+    data["per_file"] = per_file
+    return data
+
+
+def expand_paths(paths):
+    # Directories are scanned recursively, in sorted order.
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def join_words(words, limit=None):
+    if limit is None or len(words) <= limit:
+        return ", ".join(words)
+    return "{} (+{} more)".format(", ".join(words[:limit]), len(words) - limit)
+
+
+def report(data, top=None):
+    # top=N keeps the report small for big vocabularies: N words per list, the top and
+    # bottom N frequencies, and no full words list or unique-word set.
     with open("report.txt", "w") as f:
         f.write("TEXT ANALYSIS REPORT\n")
         f.write("====================\n\n")
 
+        # Approximate scans estimate the unique count and only know the heavy hitters.
+        approximate = "sketch" in data
         f.write(f"Total Words: {data['total_words']}\n")
-        f.write(f"Total Unique Words: {data['total_unique_words']}\n\n")
+        f.write("Total Unique Words: {}{}\n\n".format("~" if approximate else "", data['total_unique_words']))
 
         # MULTIPLE WORDS SUPPORTED
-        f.write("Least Frequent Words: {}\n".format(", ".join(data['least_frequent'])))
-        f.write("Most Frequent Words: {}\n\n".format(", ".join(data['most_frequent'])))
+        if data['least_frequent'] is not None:
+            f.write("Least Frequent Words: {}\n".format(join_words(data['least_frequent'], top)))
+        f.write("Most Frequent Words: {}\n\n".format(join_words(data['most_frequent'], top)))
 
-        f.write("Word Frequencies:\n")
-        for word, freq in data['frequency'].items():
-            f.write(f"{word}: {freq}\n")
+        if top is not None:
+            f.write(f"Top {top} Estimated Frequencies:\n" if approximate else f"Top {top} Word Frequencies:\n")
+            for word, freq in top_n(data['frequency'], top):
+                f.write(f"{word}: {freq}\n")
+            if not approximate:
+                f.write(f"\nBottom {top} Word Frequencies:\n")
+                for word, freq in bottom_n(data['frequency'], top):
+                    f.write(f"{word}: {freq}\n")
+        else:
+            f.write("Estimated Frequencies (heavy hitters):\n" if approximate else "Word Frequencies:\n")
+            for word, freq in data['frequency'].items():
+                f.write(f"{word}: {freq}\n")
 
-        f.write("\nAll Words List:\n")
-        f.write(", ".join(data['words_list']) + "\n")
+        # Streaming scans only keep the words list when asked to.
+        if data['words_list'] is not None and top is None:
+            f.write("\nAll Words List:\n")
+            f.write(", ".join(data['words_list']) + "\n")
 
-        f.write("\nUnique Words Set:\n")
-        f.write(", ".join(data['unique_words']) + "\n")
+        if data['unique_words'] is not None and top is None:
+            f.write("\nUnique Words Set:\n")
+            f.write(", ".join(data['unique_words']) + "\n")
 
+        if "per_file" in data:
+            if approximate:
+                f.write("\nPer-File Totals (words):\n")
+                for path, stats in data['per_file'].items():
+                    f.write(f"{path}: {stats['total_words']}\n")
+            else:
+                f.write("\nPer-File Totals (words / unique):\n")
+                for path, stats in data['per_file'].items():
+                    f.write(f"{path}: {stats['total_words']} / {stats['total_unique_words']}\n")
 
-paragraph = input("Enter a paragraph of text:\n")
-data = scan_text(paragraph)
-report(data)
 
-print("Report generated successfully as report.txt")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word-frequency report for a paragraph, files or directories.")
+    parser.add_argument("paths", nargs="*", help="text files or directories (prompts for a paragraph if omitted)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for scanning several files or big files (default: all CPUs)")
+    parser.add_argument("--approximate", action="store_true",
+                        help="fixed-memory sketches instead of exact counts (see README for error bounds)")
+    parser.add_argument("--top", type=int, default=None, metavar="N",
+                        help="only list the N most and least frequent words instead of every word")
+    args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be positive")
+
+    if not args.paths:
+        paragraph = input("Enter a paragraph of text:\n")
+        data = scan_text(paragraph, approximate=args.approximate)
+    else:
+        data = scan_corpus(expand_paths(args.paths), workers=args.workers, approximate=args.approximate)
+    report(data, top=args.top)
+
+    print("Report generated successfully as report.txt")
@@ -0,0 +1,382 @@
+"""
+Fixed-memory word statistics for the approximate mode of mini_project_day2.
+
+CountMinSketch answers "how often did this word occur?", SpaceSaving keeps the
+heaviest words, HyperLogLog estimates the number of distinct words. WordSketch
+bundles the three. All of them merge across shards and round-trip through bytes.
+
+Words are hashed with blake2b rather than hash(), which is salted per process:
+sketches built by different workers, or saved on another day, must agree on where
+each word lands to be mergeable.
+"""
+
+import hashlib
+import heapq
+import math
+import struct
+import sys
+from array import array
+from collections import Counter
+
+MASK32 = 0xFFFFFFFF
+
+
+def word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def word_hashes(words):
+    blake2b, from_bytes = hashlib.blake2b, int.from_bytes
+    return [from_bytes(blake2b(word.encode("utf-8"), digest_size=8).digest(), "little") for word in words]
+
+
+def _unpack(layout, blob, offset, name):
+    # Short or corrupt input surfaces as ValueError, like every other from_bytes check.
+    try:
+        return layout.unpack_from(blob, offset)
+    except struct.error:
+        raise ValueError(f"truncated {name}") from None
+
+
+def _table_bytes(table):
+    # Serialized tables are little-endian whatever the machine.
+    if sys.byteorder == "big":
+        table = array(table.typecode, table)
+        table.byteswap()
+    return table.tobytes()
+
+
+def _table_from_bytes(typecode, blob):
+    table = array(typecode)
+    table.frombytes(blob)
+    if sys.byteorder == "big":
+        table.byteswap()
+    return table
+
+
+class CountMinSketch:
+    # estimate(word) >= the true count, and <= true count + epsilon * total with
+    # probability 1 - delta, where epsilon = e / width and delta = exp(-depth).
+    HEADER = struct.Struct("<4sIIq")
+    MAGIC = b"CMS1"
+
+    def __init__(self, width=2719, depth=5):
+        if not isinstance(width, int) or not isinstance(depth, int):
+            raise TypeError("width and depth must be integers")
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = array("q", [0]) * (width * depth)
+
+    @classmethod
+    def from_error(cls, epsilon=0.001, delta=0.01):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    @property
+    def epsilon(self):
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        return math.exp(-self.depth)
+
+    def _cells(self, h):
+        # Double hashing: row i uses h1 + i * h2, like BloomFilter in the day4 toolkit.
+        h1, h2 = h & MASK32, (h >> 32) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, word, count=1, h=None):
+        table = self._table
+        for cell in self._cells(word_hash(word) if h is None else h):
+            table[cell] += count
+        self.total += count
+
+    def add_many(self, hashes, counts):
+        # Row by row over the whole batch: same cells as add(), without a call per word.
+        table, width = self._table, self.width
+        h1s = [h & MASK32 for h in hashes]
+        h2s = [(h >> 32) | 1 for h in hashes]
+        for row in range(self.depth):
+            base = row * width
+            for h1, h2, count in zip(h1s, h2s, counts):
+                table[base + (h1 + row * h2) % width] += count
+        self.total += sum(counts)
+
+    def estimate(self, word, h=None):
+        table = self._table
+        return min(table[cell] for cell in self._cells(word_hash(word) if h is None else h))
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("can only merge sketches with the same width and depth")
+        self._table = array("q", map(int.__add__, self._table, other._table))
+        self.total += other.total
+        return self
+
+    @property
+    def nbytes(self):
+        return len(self._table) * self._table.itemsize
+
+    def to_bytes(self):
+        return self.HEADER.pack(self.MAGIC, self.width, self.depth, self.total) + _table_bytes(self._table)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, width, depth, total = _unpack(cls.HEADER, blob, 0, "CountMinSketch")
+        if magic != cls.MAGIC:
+            raise ValueError("not a serialized CountMinSketch")
+        if len(blob) - cls.HEADER.size != 8 * width * depth:
+            raise ValueError("truncated CountMinSketch")
+        sketch = cls(width, depth)
+        sketch.total = total
+        sketch._table = _table_from_bytes("q", blob[cls.HEADER.size:])
+        return sketch
+
+
+class SpaceSaving:
+    # Monitors at most k words. Every word whose true count exceeds total / k is
+    # monitored, and each monitored count overestimates the truth by at most its
+    # error term, which is itself at most total / k.
+    HEADER = struct.Struct("<4sIqI")
+    ENTRY = struct.Struct("<qqI")
+    MAGIC = b"SPS1"
+
+    def __init__(self, k=100):
+        if not isinstance(k, int):
+            raise TypeError("k must be an integer")
+        if k < 1:
+            raise ValueError("k must be positive")
+        self.k = k
+        self.total = 0
+        self._counts = {}   # word -> [count, error]
+        self._heap = []     # (count lower bound, word), one entry per monitored word
+
+    def add(self, word, count=1):
+        self.total += count
+        counts = self._counts
+        entry = counts.get(word)
+        if entry is not None:
+            entry[0] += count
+            return
+        if len(counts) < self.k:
+            counts[word] = [count, 0]
+            heapq.heappush(self._heap, (count, word))
+            return
+        # Counts only grow, so heap entries are lower bounds: refresh stale ones until
+        # the top is exact, and that top is the minimum. Ties evict the smallest word.
+        heap = self._heap
+        while True:
+            low, victim = heap[0]
+            current = counts[victim][0]
+            if current == low:
+                break
+            heapq.heapreplace(heap, (current, victim))
+        del counts[victim]
+        counts[word] = [low + count, low]
+        heapq.heapreplace(heap, (low + count, word))
+
+    @classmethod
+    def from_counts(cls, counts, k=100):
+        """Summary of an exactly counted batch: its k heaviest words, with no error."""
+        summary = cls(k)
+        for word, count in counts.most_common(k):
+            summary._counts[word] = [count, 0]
+            summary._heap.append((count, word))
+        heapq.heapify(summary._heap)
+        summary.total = sum(counts.values())
+        return summary
+
+    def _floor(self):
+        # Upper bound on the count of any word that is not monitored.
+        if len(self._counts) < self.k:
+            return 0
+        return min(count for count, _ in self._counts.values())
+
+    def items(self):
+        """(word, count, error) for the monitored words, heaviest first, ties by word."""
+        ranked = sorted(self._counts.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(word, count, error) for word, (count, error) in ranked]
+
+    def merge(self, other):
+        # Mergeable summaries (Agarwal et al.): a word missing from one side may have
+        # occurred there up to that side's floor, so the floor is added as count and error.
+        # Any k combined counts still sum to at most self.total + other.total, so the new
+        # floor, and every error, stays within total / k.
+        floor_a, floor_b = self._floor(), other._floor()
+        combined = []
+        for word in self._counts.keys() | other._counts.keys():
+            count_a, error_a = self._counts.get(word, (floor_a, floor_a))
+            count_b, error_b = other._counts.get(word, (floor_b, floor_b))
+            combined.append((word, count_a + count_b, error_a + error_b))
+        kept = heapq.nsmallest(self.k, combined, key=lambda entry: (-entry[1], entry[0]))
+        self._counts = {word: [count, error] for word, count, error in kept}
+        self._heap = [(count, word) for word, count, _ in kept]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def to_bytes(self):
+        parts = [self.HEADER.pack(self.MAGIC, self.k, self.total, len(self._counts))]
+        for word, count, error in self.items():
+            encoded = word.encode("utf-8")
+            parts.append(self.ENTRY.pack(count, error, len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, k, total, n = _unpack(cls.HEADER, blob, 0, "SpaceSaving summary")
+        if magic != cls.MAGIC or n > k:
+            raise ValueError("not a serialized SpaceSaving summary")
+        summary = cls(k)
+        summary.total = total
+        offset = cls.HEADER.size
+        for _ in range(n):
+            count, error, size = _unpack(cls.ENTRY, blob, offset, "SpaceSaving summary")
+            offset += cls.ENTRY.size
+            if offset + size > len(blob):
+                raise ValueError("truncated SpaceSaving summary")
+            word = bytes(blob[offset:offset + size]).decode("utf-8")
+            offset += size
+            summary._counts[word] = [count, error]
+            summary._heap.append((count, word))
+        if offset != len(blob):
+            raise ValueError("trailing data after SpaceSaving summary")
+        heapq.heapify(summary._heap)
+        return summary
+
+
+class HyperLogLog:
+    # 2 ** precision one-byte registers; relative standard error 1.04 / sqrt(2 ** precision),
+    # about 0.8% at the default precision of 14 (16 KiB).
+    HEADER = struct.Struct("<4sB")
+    MAGIC = b"HLL1"
+
+    def __init__(self, precision=14):
+        if not isinstance(precision, int):
+            raise TypeError("precision must be an integer")
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @property
+    def standard_error(self):
+        return 1.04 / math.sqrt(len(self._registers))
+
+    def add(self, word, h=None):
+        self.add_many([word_hash(word) if h is None else h])
+
+    def add_many(self, hashes):
+        registers = self._registers
+        rest_bits = 64 - self.precision
+        rest_mask = (1 << rest_bits) - 1
+        for h in hashes:
+            index = h >> rest_bits
+            rank = rest_bits - (h & rest_mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def count(self):
+        registers = self._registers
+        m = len(registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -rank for rank in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return round(estimate)
+
+    def merge(self, other):
+        if self.precision != other.precision:
+            raise ValueError("can only merge HyperLogLogs with the same precision")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    @property
+    def nbytes(self):
+        return len(self._registers)
+
+    def to_bytes(self):
+        return self.HEADER.pack(self.MAGIC, self.precision) + bytes(self._registers)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, precision = _unpack(cls.HEADER, blob, 0, "HyperLogLog")
+        if magic != cls.MAGIC:
+            raise ValueError("not a serialized HyperLogLog")
+        sketch = cls(precision)
+        registers = blob[cls.HEADER.size:]
+        if len(registers) != len(sketch._registers):
+            raise ValueError("truncated HyperLogLog")
+        sketch._registers = bytearray(registers)
+        return sketch
+
+
+class WordSketch:
+    # Memory is fixed by the parameters, not by the vocabulary: about 106 KiB for the
+    # Count-Min table, 16 KiB of HyperLogLog registers and top_k monitored words.
+    HEADER = struct.Struct("<4sIII")
+    MAGIC = b"WSK1"
+
+    def __init__(self, top_k=100, epsilon=0.001, delta=0.01, precision=14, _parts=None):
+        if _parts is None:
+            _parts = (CountMinSketch.from_error(epsilon, delta), SpaceSaving(top_k), HyperLogLog(precision))
+        self.counts, self.heavy, self.distinct = _parts
+
+    @property
+    def total_words(self):
+        return self.counts.total
+
+    def update(self, words):
+        # Count the batch exactly first, then feed each sketch the batch's distinct words:
+        # hashing and table updates run once per distinct word, not once per occurrence.
+        batch = Counter(words)
+        hashes = word_hashes(batch)
+        self.counts.add_many(hashes, list(batch.values()))
+        self.distinct.add_many(hashes)
+        self.heavy.merge(SpaceSaving.from_counts(batch, self.heavy.k))
+
+    def estimate(self, word):
+        return self.counts.estimate(word)
+
+    def top(self):
+        """(word, estimated count) for the heavy hitters, heaviest first, ties by word."""
+        # Both estimates only overestimate, so the smaller one is the tighter bound.
+        counts = self.counts
+        ranked = [(word, min(count, counts.estimate(word))) for word, count, _ in self.heavy.items()]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked
+
+    def merge(self, other):
+        self.counts.merge(other.counts)
+        self.heavy.merge(other.heavy)
+        self.distinct.merge(other.distinct)
+        return self
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + self.distinct.nbytes
+
+    def to_bytes(self):
+        parts = [self.counts.to_bytes(), self.heavy.to_bytes(), self.distinct.to_bytes()]
+        return self.HEADER.pack(self.MAGIC, *map(len, parts)) + b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, *sizes = _unpack(cls.HEADER, blob, 0, "WordSketch")
+        if magic != cls.MAGIC:
+            raise ValueError("not a serialized WordSketch")
+        if cls.HEADER.size + sum(sizes) != len(blob):
+            raise ValueError("truncated WordSketch")
+        offset = cls.HEADER.size
+        parts = []
+        for part_cls, size in zip((CountMinSketch, SpaceSaving, HyperLogLog), sizes):
+            parts.append(part_cls.from_bytes(blob[offset:offset + size]))
+            offset += size
+        return cls(_parts=tuple(parts))
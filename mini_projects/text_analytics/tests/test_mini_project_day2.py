@@ -0,0 +1,187 @@
+import codecs
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+from mini_projects.text_analytics import mini_project_day2
+from mini_projects.text_analytics.mini_project_day2 import (
+    bottom_n,
+    expand_paths,
+    merge_counters,
+    plan_ranges,
+    scan_corpus,
+    scan_file,
+    scan_stream,
+    scan_text,
+    top_n,
+)
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mini_project_day2.py")
+SAMPLE = (
+    "Naïve café-owners don't panic!  The café's CAFÉ, the naïve owner's café...\n"
+    "日本語 テキスト, 日本語!\tcafé été — end"
+)
+
+
+def split_every(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestTextAnalytics(unittest.TestCase):
+    """Streaming scans must agree with scan_text on the whole text."""
+
+    def assertSameScan(self, data, expected, words=False):
+        if not words:
+            expected = dict(expected, words_list=None)
+        self.assertEqual(data, expected)
+        self.assertEqual(list(data["frequency"]), list(expected["frequency"]))  # first-seen order
+
+    # --- Streaming (scan_stream / scan_file) ---
+    def test_scan_stream_words_split_across_chunks(self):
+        expected = scan_text(SAMPLE)
+        for size in (1, 2, 3, 5, 8, 13, len(SAMPLE)):
+            with self.subTest(size=size):
+                self.assertSameScan(scan_stream(split_every(SAMPLE, size), keep_words=True), expected, True)
+                self.assertSameScan(scan_stream(split_every(SAMPLE, size)), expected)
+
+    def test_scan_stream_multibyte_characters_split_across_chunks(self):
+        # Byte blocks cut inside UTF-8 sequences, decoded incrementally into str chunks.
+        raw = SAMPLE.encode("utf-8")
+        expected = scan_text(SAMPLE)
+        for size in (1, 2, 3, 5):
+            with self.subTest(size=size):
+                blocks = [raw[i:i + size] for i in range(0, len(raw), size)]
+                chunks = codecs.iterdecode(blocks, "utf-8")
+                self.assertSameScan(scan_stream(chunks, keep_words=True), expected, True)
+
+    def test_scan_stream_edge_chunks(self):
+        # Punctuation-only and whitespace-only chunks between the halves of a word.
+        chunks = ["do", "n", "'", "t", " ", "", "stop", "!", "  ", "sto", "p"]
+        self.assertSameScan(scan_stream(chunks, keep_words=True), scan_text("".join(chunks)), True)
+        self.assertSameScan(scan_stream([]), scan_text(""))
+
+    def test_scan_file_multibyte_characters(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sample.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SAMPLE * 3)
+            expected = scan_text(SAMPLE * 3)
+            for chunk_size in (1, 2, 3, 4, 7, 1 << 20):
+                with self.subTest(chunk_size=chunk_size):
+                    self.assertSameScan(scan_file(path, chunk_size=chunk_size), expected)
+            self.assertSameScan(scan_file(path, keep_words=True, chunk_size=5), expected, True)
+
+    def test_summary_does_not_copy_the_vocabulary(self):
+        data = scan_stream(split_every(SAMPLE, 7))
+        self.assertIsInstance(data["frequency"], Counter)
+        self.assertEqual(type(data["unique_words"]), type(data["frequency"].keys()))
+        self.assertEqual(set(data["unique_words"]), set(data["frequency"]))
+
+    # --- Parallel corpus scan (scan_corpus) ---
+    def write_corpus(self, tmpdir):
+        texts = [SAMPLE, "", "solo", SAMPLE.upper() * 4, "the end, the END.\n" * 20]
+        paths = []
+        for i, text in enumerate(texts):
+            path = os.path.join(tmpdir, f"doc{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            paths.append(path)
+        return texts, paths
+
+    def assertSameCorpusScan(self, data, texts, paths):
+        per_file = data.pop("per_file")
+        self.assertSameScan(data, scan_text(" ".join(texts)))
+        self.assertEqual(list(per_file), paths)
+        for path, text in zip(paths, texts):
+            expected = scan_text(text)
+            self.assertEqual(per_file[path], {key: expected[key] for key in
+                                              ("most_frequent", "least_frequent", "total_words", "total_unique_words")})
+
+    def test_scan_corpus_matches_scan_text(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            texts, paths = self.write_corpus(tmpdir)
+            for workers in (1, 3):
+                for split_bytes in (mini_project_day2.SPLIT_BYTES, 64, 7, 1):
+                    with self.subTest(workers=workers, split_bytes=split_bytes):
+                        data = scan_corpus(paths, workers=workers, split_bytes=split_bytes)
+                        self.assertSameCorpusScan(data, texts, paths)
+            self.assertEqual(list(expand_paths([tmpdir])), paths)
+
+    def test_scan_corpus_incremental_decoding(self):
+        # Ranges bigger than one read: UTF-8 sequences are cut between reads.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            texts, paths = self.write_corpus(tmpdir)
+            with mock.patch.object(mini_project_day2, "READ_BYTES", 3):
+                for split_bytes in (mini_project_day2.SPLIT_BYTES, 50):
+                    with self.subTest(split_bytes=split_bytes):
+                        data = scan_corpus(paths, workers=1, split_bytes=split_bytes)
+                        self.assertSameCorpusScan(data, texts, paths)
+
+    def test_plan_ranges_cut_after_whitespace(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "big.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SAMPLE * 5)
+            with open(path, "rb") as f:
+                raw = f.read()
+            ranges = plan_ranges(path, 16)
+            self.assertGreater(len(ranges), 1)
+            self.assertEqual(ranges[0][1], 0)
+            self.assertEqual(ranges[-1][2], len(raw))
+            for (_, _, end), (_, start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+                self.assertIn(raw[end - 1:end], (b" ", b"\t", b"\n"))
+            self.assertEqual(plan_ranges(path, len(raw)), [(path, 0, len(raw))])
+
+    def test_merge_counters_keeps_first_seen_order(self):
+        parts = [Counter(text.split()) for text in ("a b", "c a", "d", "b e", "f")]
+        merged = merge_counters(parts)
+        self.assertEqual(list(merged.items()), list(Counter("a b c a d b e f".split()).items()))
+        self.assertEqual(merge_counters([]), Counter())
+
+    # --- Ranking (top_n / bottom_n / --top) ---
+    def test_top_n_bottom_n_ties_in_first_seen_order(self):
+        frequency = Counter("d b a b c a e a".split())  # a:3, b:2, d/c/e:1
+        self.assertEqual(top_n(frequency, 1), [("a", 3)])
+        self.assertEqual(top_n(frequency, 3), [("a", 3), ("b", 2), ("d", 1)])
+        self.assertEqual(top_n(frequency, 4), frequency.most_common(4))
+        self.assertEqual(bottom_n(frequency, 2), [("d", 1), ("c", 1)])
+        self.assertEqual(bottom_n(frequency, 4), [("d", 1), ("c", 1), ("e", 1), ("b", 2)])
+
+    def test_top_n_bottom_n_sizes(self):
+        frequency = Counter("x y y z z z".split())
+        self.assertEqual(top_n(frequency, 0), [])
+        self.assertEqual(bottom_n(frequency, 0), [])
+        self.assertEqual(top_n(frequency, 10), [("z", 3), ("y", 2), ("x", 1)])
+        self.assertEqual(bottom_n(frequency, 10), [("x", 1), ("y", 2), ("z", 3)])
+        self.assertEqual(top_n({}, 5), [])
+        with self.assertRaises(ValueError):
+            top_n(frequency, -1)
+
+    def test_report_top_option(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "doc.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("the cat the dog a b c d e the")
+            subprocess.run([sys.executable, SCRIPT, path, "--top", "2", "--workers", "1"],
+                           cwd=tmpdir, check=True, capture_output=True)
+            with open(os.path.join(tmpdir, "report.txt"), encoding="utf-8") as f:
+                report = f.read()
+            self.assertIn("Least Frequent Words: cat, dog (+5 more)\n", report)
+            self.assertIn("Most Frequent Words: the\n", report)
+            self.assertIn("Top 2 Word Frequencies:\nthe: 3\ncat: 1\n", report)
+            self.assertIn("Bottom 2 Word Frequencies:\ncat: 1\ndog: 1\n", report)
+            self.assertNotIn("Unique Words Set", report)
+            self.assertNotIn("\ne: 1", report)  # not every word is listed
+
+            proc = subprocess.run([sys.executable, SCRIPT, path, "--top", "0"],
+                                  cwd=tmpdir, capture_output=True, text=True)
+            self.assertNotEqual(proc.returncode, 0)
+            self.assertIn("--top must be positive", proc.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import random
+import unittest
+from collections import Counter
+
+from mini_projects.text_analytics.sketches import (
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSaving,
+    WordSketch,
+    word_hash,
+)
+
+
+def zipf_stream(n, vocabulary, seed=0):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    return rng.choices(words, weights=[1 / (i + 1) for i in range(vocabulary)], k=n)
+
+
+class TestSketches(unittest.TestCase):
+    """Error bounds, merging and serialization of the approximate-mode sketches."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stream = zipf_stream(20_000, 2_000)
+        cls.exact = Counter(cls.stream)
+
+    def shards(self, parts):
+        size = len(self.stream) // parts + 1
+        return [self.stream[i:i + size] for i in range(0, len(self.stream), size)]
+
+    # --- Count-Min Sketch ---
+    def test_count_min_error_bound(self):
+        sketch = CountMinSketch.from_error(epsilon=0.01, delta=0.01)
+        self.assertEqual((sketch.width, sketch.depth), (272, 5))
+        for word in self.stream:
+            sketch.add(word)
+        bound = sketch.epsilon * len(self.stream)
+        over = [sketch.estimate(word) - count for word, count in self.exact.items()]
+        self.assertGreaterEqual(min(over), 0)  # never underestimates
+        self.assertLessEqual(sum(o > bound for o in over), sketch.delta * len(over))
+        self.assertLessEqual(sketch.estimate("never seen"), bound)
+
+    def test_count_min_add_many_and_merge(self):
+        whole, merged = CountMinSketch(512, 4), CountMinSketch(512, 4)
+        for word in self.stream:
+            whole.add(word)
+        for shard in self.shards(3):
+            part = CountMinSketch(512, 4)
+            counts = Counter(shard)
+            part.add_many([word_hash(w) for w in counts], list(counts.values()))
+            merged.merge(part)
+        self.assertEqual(merged.to_bytes(), whole.to_bytes())
+        with self.assertRaises(ValueError):
+            merged.merge(CountMinSketch(256, 4))
+
+    # --- Space-Saving ---
+    def assert_space_saving_bounds(self, summary, n):
+        self.assertEqual(summary.total, n)
+        for word, count, error in summary.items():
+            self.assertLessEqual(count - error, self.exact[word])
+            self.assertLessEqual(self.exact[word], count)
+            self.assertLessEqual(error, n / summary.k)
+        monitored = {word for word, _, _ in summary.items()}
+        for word, count in self.exact.items():
+            if count > n / summary.k:
+                self.assertIn(word, monitored)
+
+    def test_space_saving_bounds(self):
+        summary = SpaceSaving(k=50)
+        for word in self.stream:
+            summary.add(word)
+        self.assert_space_saving_bounds(summary, len(self.stream))
+        self.assertEqual(summary.items()[0][0], self.exact.most_common(1)[0][0])
+
+    def test_space_saving_merge_keeps_bounds(self):
+        merged = SpaceSaving(k=50)
+        for shard in self.shards(7):
+            merged.merge(SpaceSaving.from_counts(Counter(shard), 50))
+        self.assert_space_saving_bounds(merged, len(self.stream))
+        self.assertEqual(len(merged.items()), 50)
+
+    def test_space_saving_ties_are_deterministic(self):
+        summary = SpaceSaving(k=2)
+        for word in ["b", "a", "c"]:
+            summary.add(word)
+        # "a" and "b" tie at 1; the smaller word is evicted and its count inherited.
+        self.assertEqual(summary.items(), [("c", 2, 1), ("b", 1, 0)])
+
+    # --- HyperLogLog ---
+    def test_hyperloglog_accuracy_and_merge(self):
+        small = HyperLogLog(precision=12)
+        for i in range(100):
+            small.add(f"x{i}")
+        self.assertEqual(small.count(), 100)  # linear counting is near-exact when sparse
+
+        left, right, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+        for i in range(30_000):
+            word = f"y{i}"
+            (left if i % 2 else right).add(word)
+            union.add(word)
+        left.merge(right)
+        self.assertEqual(left.to_bytes(), union.to_bytes())
+        self.assertLess(abs(left.count() - 30_000) / 30_000, 4 * left.standard_error)
+        with self.assertRaises(ValueError):
+            left.merge(HyperLogLog(10))
+
+    # --- WordSketch ---
+    def test_word_sketch_summary_and_merge(self):
+        whole = WordSketch(top_k=20)
+        whole.update(self.stream)
+        merged = WordSketch(top_k=20)
+        for shard in self.shards(4):
+            part = WordSketch(top_k=20)
+            part.update(shard)
+            merged.merge(part)
+        for sketch in (whole, merged):
+            self.assertEqual(sketch.total_words, len(self.stream))
+            top = sketch.top()
+            self.assertEqual([w for w, _ in top[:3]], [w for w, _ in self.exact.most_common(3)])
+            for word, count in top:
+                self.assertGreaterEqual(count, self.exact[word])
+        self.assertEqual(merged.counts.to_bytes(), whole.counts.to_bytes())
+        self.assertEqual(merged.distinct.count(), whole.distinct.count())
+
+    def test_serialization_round_trip(self):
+        sketch = WordSketch(top_k=10, precision=10)
+        sketch.update(self.stream + ["naïve", "日本"])
+        blob = sketch.to_bytes()
+        restored = WordSketch.from_bytes(blob)
+        self.assertEqual(restored.to_bytes(), blob)
+        self.assertEqual(restored.top(), sketch.top())
+        self.assertEqual(restored.distinct.count(), sketch.distinct.count())
+        self.assertEqual(restored.estimate("naïve"), sketch.estimate("naïve"))
+        for part in (sketch.counts, sketch.heavy, sketch.distinct):
+            self.assertEqual(type(part).from_bytes(part.to_bytes()).to_bytes(), part.to_bytes())
+
+    def test_from_bytes_rejects_bad_data(self):
+        sketch = WordSketch(top_k=5, precision=8)
+        sketch.update(["a", "b", "a"])
+        cases = [
+            (WordSketch, sketch.to_bytes()),
+            (CountMinSketch, sketch.counts.to_bytes()),
+            (SpaceSaving, sketch.heavy.to_bytes()),
+            (HyperLogLog, sketch.distinct.to_bytes()),
+        ]
+        for cls, blob in cases:
+            with self.subTest(cls=cls.__name__):
+                for bad in (b"", blob[:3], blob[:-1], b"XXXX" + blob[4:], blob + b"\0"):
+                    with self.assertRaises(ValueError):
+                        cls.from_bytes(bad)
+        with self.assertRaises(ValueError):
+            WordSketch.from_bytes(sketch.counts.to_bytes())  # wrong kind of sketch
+
+
+if __name__ == "__main__":
+    unittest.main()